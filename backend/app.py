@@ -3,6 +3,13 @@ from flask_cors import CORS
 from config import config
 from utils.db import db, init_db
 from utils.jwt_helper import jwt, init_jwt
+from utils.etag import init_versions, bump_versions
+from utils.cache import init_cache
+from utils.idempotency import init_idempotency
+from utils.outbox import init_outbox
+from utils.events import init_events
+from utils.json_provider import init_json
+from utils.compression import init_compression
 import os
 
 # Import routes
@@ -15,6 +22,9 @@ from routes.payment import payment_bp
 from routes.department import department_bp
 from routes.user import user_bp
 from routes.init import init_bp
+from routes.dashboard import dashboard_bp
+from routes.ledger import ledger_bp
+from routes.events import events_bp
 
 def create_app(config_name='development'):
     """Application factory"""
@@ -28,13 +38,20 @@ def create_app(config_name='development'):
         r"/*": {
             "origins": "*",
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization", "Accept"],
+            "allow_headers": ["Content-Type", "Authorization", "Accept", "If-Match", "Idempotency-Key"],
             "expose_headers": ["Content-Type", "Authorization"],
             "supports_credentials": False
         }
     })
     init_db(app)
+    init_versions(app)
+    init_cache(app)
+    init_idempotency(app)
+    init_json(app)
+    init_compression(app)
     init_jwt(app)
+    init_outbox(app)
+    init_events(app)
     
     # Create upload folder if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -49,6 +66,9 @@ def create_app(config_name='development'):
     app.register_blueprint(department_bp, url_prefix='/api')
     app.register_blueprint(user_bp, url_prefix='/api')
     app.register_blueprint(init_bp, url_prefix='/api')
+    app.register_blueprint(dashboard_bp, url_prefix='/api')
+    app.register_blueprint(ledger_bp, url_prefix='/api')
+    app.register_blueprint(events_bp, url_prefix='/api')
     
     # Health check endpoint
     @app.route('/')
@@ -72,7 +92,9 @@ def create_app(config_name='development'):
     def run_migration():
         """Temporary endpoint to run database migration"""
         try:
-            from sqlalchemy import text
+            from sqlalchemy import text, inspect
+            
+            user_columns = [column['name'] for column in inspect(db.engine).get_columns('users')]
             
             # Add salary and salary_balance columns to users table
             db.session.execute(text("""
@@ -85,6 +107,37 @@ def create_app(config_name='development'):
                 ADD COLUMN IF NOT EXISTS salary_balance FLOAT DEFAULT 0.0
             """))
             
+            db.session.execute(text("""
+                ALTER TABLE users 
+                ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0
+            """))
+            
+            db.session.execute(text("""
+                ALTER TABLE payments 
+                ADD COLUMN IF NOT EXISTS period VARCHAR(7)
+            """))
+            
+            if 'balance_cents' not in user_columns:
+                # Same backfill as migration d7f3b9e6a2c1: existing balances become opening entries
+                db.session.execute(text("""
+                    ALTER TABLE users 
+                    ADD COLUMN balance_cents BIGINT NOT NULL DEFAULT 0
+                """))
+                db.session.execute(text("""
+                    UPDATE users SET balance_cents = CAST(ROUND(COALESCE(salary_balance, 0) * 100) AS BIGINT)
+                """))
+                db.session.execute(text("""
+                    INSERT INTO salary_ledger (worker_id, amount_cents, kind, created_at)
+                    SELECT id, balance_cents, 'opening', CURRENT_TIMESTAMP FROM users WHERE balance_cents != 0
+                """))
+            
+            # Optimistic concurrency counters
+            for table in ['tasks', 'payments', 'users', 'contracts']:
+                db.session.execute(text(f"""
+                    ALTER TABLE {table} 
+                    ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1
+                """))
+            
             # Add approved_at and supervisor_comment columns to tasks table
             db.session.execute(text("""
                 ALTER TABLE tasks 
@@ -96,12 +149,21 @@ def create_app(config_name='development'):
                 ADD COLUMN IF NOT EXISTS supervisor_comment TEXT
             """))
             
-            # Update existing workers
+            # Update existing workers: opening balance equals salary, posted through the ledger
+            db.session.execute(text("""
+                INSERT INTO salary_ledger (worker_id, amount_cents, kind, created_at)
+                SELECT id, CAST(ROUND(salary * 100) AS BIGINT) - balance_cents, 'opening', CURRENT_TIMESTAMP
+                FROM users
+                WHERE role = 'worker' AND salary IS NOT NULL AND salary_balance IS NULL
+                  AND CAST(ROUND(salary * 100) AS BIGINT) != balance_cents
+            """))
             db.session.execute(text("""
                 UPDATE users 
-                SET salary_balance = COALESCE(salary, 0.0)
+                SET balance_cents = CAST(ROUND(salary * 100) AS BIGINT),
+                    salary_balance = CAST(ROUND(salary * 100) AS BIGINT) / 100.0
                 WHERE role = 'worker' AND salary IS NOT NULL AND salary_balance IS NULL
             """))
+            bump_versions('salary_ledger')
             
             db.session.commit()
             
@@ -0,0 +1,148 @@
+"""
+Query plans and timings for the role-filtered list queries, with and without indexes.
+
+Seeds a database with --tasks tasks (default 1,000,000), their workers and
+supervisors, and a payment for every fifth task. It then runs the hot filters
+from routes/*.py twice: once on the baseline schema (primary keys and
+users.email only) and once with the indexes the models declare. For each
+query it prints the plan and the median time of --repeat runs.
+
+Run from backend/: python benchmarks/index_plans.py [--tasks 1000000] [--database-url URL]
+Without --database-url a throwaway SQLite file is used. A PostgreSQL URL
+works too, but point it at an empty scratch database: every table is
+dropped and recreated.
+"""
+from datetime import datetime, timedelta
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+WORKERS = 2000
+SUPERVISORS = 50
+DEPARTMENTS = 20
+CHUNK = 50000
+
+def seed(db, tasks):
+    from sqlalchemy import insert
+    from models.department import Department
+    from models.payment import Payment
+    from models.task import Task
+    from models.user import User
+    
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        connection.execute(insert(Department.__table__), [{'name': f'Department {i}'} for i in range(DEPARTMENTS)])
+        connection.execute(insert(User.__table__), [
+            {'full_name': f'User {i}', 'email': f'user{i}@county.go.ke', 'password_hash': 'x',
+             'role': 'supervisor' if i < SUPERVISORS else 'worker',
+             'department_id': i % DEPARTMENTS + 1, 'salary': 1000.0, 'created_at': now}
+            for i in range(SUPERVISORS + WORKERS)
+        ])
+    
+    statuses = ['incomplete', 'completed', 'approved', 'denied']
+    for start in range(0, tasks, CHUNK):
+        with db.engine.begin() as connection:
+            ids = range(start + 1, min(start + CHUNK, tasks) + 1)
+            connection.execute(insert(Task.__table__), [
+                {'id': i, 'title': 'Task', 'description': 'd',
+                 'assigned_to': SUPERVISORS + i % WORKERS + 1, 'supervisor_id': i % SUPERVISORS + 1,
+                 'progress_status': statuses[i // 3 % 4], 'start_date': now, 'end_date': now,
+                 'created_at': now - timedelta(seconds=tasks - i)}
+                for i in ids
+            ])
+            connection.execute(insert(Payment.__table__), [
+                {'worker_id': SUPERVISORS + i % WORKERS + 1, 'task_id': i, 'amount': 1000.0,
+                 'status': 'paid' if i // 5 % 3 == 0 else 'unpaid', 'date': now}
+                for i in ids if i % 5 == 0
+            ])
+
+def queries():
+    """(label, SELECT) pairs following the filters in routes/*.py"""
+    from sqlalchemy import func, select
+    from models.payment import Payment
+    from models.task import Task
+    from models.user import User
+    
+    worker_id = SUPERVISORS + 11  # Has tasks, paid and unpaid payments
+    return [
+        ('supervisor: completed tasks to review',
+         select(func.count()).select_from(Task).where(Task.supervisor_id == 3, Task.progress_status == 'completed')),
+        ('worker: task list page',
+         select(Task.id).where(Task.assigned_to == worker_id).order_by(Task.created_at.desc(), Task.id.desc()).limit(20)),
+        ('worker: unpaid payments total',
+         select(func.sum(Payment.amount)).where(Payment.worker_id == worker_id, Payment.status == 'unpaid')),
+        ('approval: existing payment check',
+         select(Payment.id).where(Payment.task_id == 123456)),
+        ('department: workers',
+         select(User.id).where(User.role == 'worker', User.department_id == 4)),
+    ]
+
+def measure(db, repeat):
+    """{label: (plan, median ms)}"""
+    from sqlalchemy import text
+    explain = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    results = {}
+    with db.engine.connect() as connection:
+        for label, query in queries():
+            sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+            plan = ' / '.join(str(row[-1]).strip() for row in connection.execute(text(explain + sql)))
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                connection.execute(query).all()
+                timings.append(time.perf_counter() - start)
+            results[label] = (plan, statistics.median(timings) * 1000)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+    
+    os.environ['DATABASE_URL'] = args.database_url or f'sqlite:///{tempfile.mkdtemp()}/plans.db'
+    os.environ['FLASK_ENV'] = 'production'
+    from sqlalchemy import text
+    from app import app
+    from utils.db import db
+    
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        
+        # Baseline schema: drop every secondary index the models declare except users.email
+        indexes = [
+            index for table in db.metadata.tables.values() for index in table.indexes
+            if index.name != 'ix_users_email' and table.name in ('tasks', 'payments', 'users')
+        ]
+        for index in indexes:
+            index.drop(db.engine)
+        
+        start = time.perf_counter()
+        seed(db, args.tasks)
+        print(f'Seeded {args.tasks} tasks in {time.perf_counter() - start:.0f}s ({db.engine.dialect.name})\n')
+        
+        with db.engine.begin() as connection:
+            connection.execute(text('ANALYZE'))
+        before = measure(db, args.repeat)
+        
+        for index in indexes:
+            index.create(db.engine)
+        with db.engine.begin() as connection:
+            connection.execute(text('ANALYZE'))
+        after = measure(db, args.repeat)
+    
+    for label in before:
+        print(f'{label}: {before[label][1]:.2f}ms -> {after[label][1]:.2f}ms')
+        print(f'  before: {before[label][0]}')
+        print(f'  after:  {after[label][0]}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+JSON encoding time and compressed body size of the task listing.
+
+Seeds a throwaway SQLite database with --tasks tasks (default 20,000). It
+times encoding the full listing with Flask's default provider and with the
+orjson one (median of --repeat runs). It then requests one page of
+GET /api/tasks with each Accept-Encoding and prints the body size sent and
+the time the compression itself takes at the configured levels.
+
+Run from backend/: python benchmarks/json_compression.py [--tasks 20000] [--limit 300]
+"""
+from datetime import datetime
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+def seed(db, tasks):
+    from sqlalchemy import insert
+    from models.task import Task
+    from models.user import User
+
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        connection.execute(insert(User.__table__), [
+            {'id': 1, 'full_name': 'Supervisor', 'email': 'supervisor@county.go.ke', 'password_hash': 'x', 'role': 'supervisor'},
+            {'id': 2, 'full_name': 'Worker', 'email': 'worker@county.go.ke', 'password_hash': 'x', 'role': 'worker'}
+        ])
+        connection.execute(insert(Task.__table__), [
+            {'title': f'Task {i}', 'description': 'Clear the drainage along Market Street',
+             'assigned_to': 2, 'supervisor_id': 1, 'progress_status': 'incomplete',
+             'start_date': now, 'end_date': now, 'created_at': now}
+            for i in range(tasks)
+        ])
+
+def median_seconds(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=300, help='Page size of the compressed listing')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f'sqlite:///{tmp}/bench.db'
+        from flask.json.provider import DefaultJSONProvider
+        from app import create_app
+        from utils.db import db
+        from utils.etag import init_versions
+        from utils.json_provider import OrjsonProvider
+        from utils.jwt_helper import create_user_token
+        from utils import compression
+        from models.task import Task
+        from models.user import User
+
+        app = create_app('production')
+        with app.app_context():
+            db.create_all()
+            seed(db, args.tasks)
+        init_versions(app)
+
+        with app.app_context():
+            rows = [task.to_dict() for task in Task.listing_query().all()]
+            token = create_user_token(db.session.get(User, 1))
+            body = {'status': 'success', 'tasks': rows}
+            print(f'Encoding {len(rows)} tasks (median of {args.repeat})')
+            for name, provider in [('default', DefaultJSONProvider(app)), ('orjson', OrjsonProvider(app))]:
+                seconds = median_seconds(lambda: provider.dumps(body), args.repeat)
+                print(f'  {name:<8}{seconds * 1000:>8.1f}ms')
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        identity = client.get(f'/api/tasks?limit={args.limit}', headers=dict(headers, **{'Accept-Encoding': 'identity'})).get_data()
+        codecs = {
+            'gzip': lambda: gzip.compress(identity, compresslevel=app.config['COMPRESS_GZIP_LEVEL']),
+            'br': lambda: compression.brotli.compress(identity, quality=app.config['COMPRESS_BROTLI_QUALITY'])
+        }
+
+        print(f'GET /api/tasks?limit={args.limit}')
+        print(f'  {"identity":<10}{len(identity) / 1024:>9.1f} KB')
+        for encoding, compress in codecs.items():
+            response = client.get(f'/api/tasks?limit={args.limit}', headers=dict(headers, **{'Accept-Encoding': encoding}))
+            if response.headers.get('Content-Encoding') != encoding:
+                print(f'  {encoding:<10}not used (is the package installed?)')
+                continue
+            seconds = median_seconds(compress, args.repeat)
+            print(f'  {encoding:<10}{len(response.get_data()) / 1024:>9.1f} KB  compressing takes {seconds * 1000:.1f}ms')
+
+if __name__ == '__main__':
+    main()
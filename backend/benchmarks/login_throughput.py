@@ -0,0 +1,116 @@
+"""
+Login throughput against gunicorn worker count and class.
+
+Starts gunicorn on a throwaway SQLite database for each configuration and
+fires a burst of concurrent logins to measure throughput. It then fires a
+second burst and probes /health while it is in flight, since /health stands
+in for every other endpoint during a login storm.
+
+Run from backend/: python benchmarks/login_throughput.py [--logins 200] [--workers 1 2 4]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+def seed(database_url):
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app
+    from utils.db import db
+    from models.user import User
+    app = create_app('production')
+    with app.app_context():
+        user = User(full_name='Bench', email='bench@county.go.ke', role='worker')
+        user.set_password('password')
+        db.session.add(user)
+        db.session.commit()
+
+def request(url, body=None):
+    """(status, seconds) for one request"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+def wait_until_up(base):
+    for _ in range(100):
+        try:
+            request(base + '/health')
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('gunicorn did not start')
+
+def run(worker_class, workers, logins, concurrency, port, env):
+    base = f'http://127.0.0.1:{port}'
+    server = subprocess.Popen(
+        ['gunicorn', '-k', worker_class, '-w', str(workers), '-b', f'127.0.0.1:{port}', 'app:app'],
+        cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(base)
+        body = {'email': 'bench@county.go.ke', 'password': 'password'}
+        with ThreadPoolExecutor(concurrency + 1) as executor:
+            start = time.perf_counter()
+            results = list(executor.map(lambda _: request(base + '/auth/login', body), range(logins)))
+            elapsed = time.perf_counter() - start
+        # Probe /health for as long as a second burst is in flight
+        with ThreadPoolExecutor(concurrency) as executor:
+            burst = [executor.submit(request, base + '/auth/login', body) for _ in range(logins)]
+            health = []
+            while not all(future.done() for future in burst):
+                health.append(request(base + '/health')[1])
+                time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait()
+    
+    ok = sum(1 for status, _ in results if status == 200)
+    shed = sum(1 for status, _ in results if status == 503)
+    return {
+        'class': worker_class,
+        'workers': workers,
+        'logins_per_s': ok / elapsed,
+        'shed_503': shed,
+        'login_p50_ms': statistics.median(seconds for _, seconds in results) * 1000,
+        'health_p50_ms': statistics.median(health) * 1000 if health else 0.0,
+        'health_max_ms': max(health, default=0.0) * 1000
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--classes', nargs='+', default=['sync', 'gevent'])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f'sqlite:///{tmp}/bench.db'
+        seed(database_url)
+        env = dict(os.environ, DATABASE_URL=database_url, FLASK_ENV='production', OUTBOX_INLINE='false')
+        
+        print(f'{"class":<8}{"workers":>8}{"logins/s":>10}{"503s":>6}{"login p50":>11}{"health p50":>12}{"health max":>12}')
+        for worker_class in args.classes:
+            for port, workers in enumerate(args.workers, start=8100):
+                row = run(worker_class, workers, args.logins, args.concurrency, port, env)
+                print(f'{row["class"]:<8}{row["workers"]:>8}{row["logins_per_s"]:>10.1f}{row["shed_503"]:>6}'
+                      f'{row["login_p50_ms"]:>9.0f}ms{row["health_p50_ms"]:>10.1f}ms{row["health_max_ms"]:>10.1f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,9 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_COOKIE_CSRF_PROTECT = False  # Disable CSRF for development
+    JWT_QUERY_STRING_NAME = 'token'  # Only /api/events reads it, and only accepts stream tokens there
+    TOKEN_VERSION_CACHE_SECONDS = int(os.environ.get('TOKEN_VERSION_CACHE_SECONDS', 30))  # How stale a revoked token may be seen as valid
+    TOKEN_VERSION_CACHE_MAX = int(os.environ.get('TOKEN_VERSION_CACHE_MAX', 10000))  # Users cached per worker
     
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///county_worker.db'
@@ -19,6 +22,62 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png'}
+    
+    # Password hashing: full Werkzeug method string (with cost) and hashing processes per worker (0 = inline)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 8))  # Per worker, running or queued in the pool
+    # How long further sign-ins wait for a slot before a 503. At ~50ms per scrypt hash and
+    # 2 pool workers, 5s lets a queue of about 200 drain before anyone is turned away
+    PASSWORD_HASH_WAIT_SECONDS = float(os.environ.get('PASSWORD_HASH_WAIT_SECONDS', 5))
+    
+    # JSON encoding ('orjson' or Flask's stdlib 'default')
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    
+    # Response compression, tried in COMPRESS_ALGORITHMS order ('br' uses the Brotli package from requirements.txt)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_ALGORITHMS = ['br', 'gzip']
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # Bytes
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+    
+    # Requests running more queries than this are logged as warnings
+    QUERY_BUDGET = int(os.environ.get('QUERY_BUDGET', 10))
+    
+    # Response cache for the public jobs board and departments ('memory', 'redis' or 'none')
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', 300))
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 256))  # Per worker, memory backend only
+    
+    # Idempotency-Key store for retried POSTs ('memory', 'redis' or 'none'); use redis with several workers
+    IDEMPOTENCY_BACKEND = os.environ.get('IDEMPOTENCY_BACKEND', 'memory')
+    IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400))  # How long a key can be replayed
+    IDEMPOTENCY_MAX_ENTRIES = int(os.environ.get('IDEMPOTENCY_MAX_ENTRIES', 10000))  # Per worker, memory backend only
+    
+    # Transactional outbox: side effects run on a background thread of each web process
+    # unless a `flask worker` is deployed and OUTBOX_INLINE is set to false
+    OUTBOX_INLINE = os.environ.get('OUTBOX_INLINE', 'true').lower() == 'true'
+    OUTBOX_SWEEP_SECONDS = int(os.environ.get('OUTBOX_SWEEP_SECONDS', 30))  # Inline only: how often the background drainer runs due retries
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 100))
+    OUTBOX_POLL_SECONDS = float(os.environ.get('OUTBOX_POLL_SECONDS', 1))  # Worker sleep when nothing is due
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 8))  # Then the message is marked failed
+    OUTBOX_BACKOFF_SECONDS = int(os.environ.get('OUTBOX_BACKOFF_SECONDS', 2))  # First retry delay, doubled per attempt
+    
+    # Server-Sent Events: changes are published with pg_notify on this channel
+    EVENTS_CHANNEL = os.environ.get('EVENTS_CHANNEL', 'cwp_events')
+    EVENTS_KEEPALIVE_SECONDS = int(os.environ.get('EVENTS_KEEPALIVE_SECONDS', 15))  # Comment line sent to idle streams
+    EVENTS_TOKEN_SECONDS = int(os.environ.get('EVENTS_TOKEN_SECONDS', 60))  # Lifetime of a ?token= for opening a stream
+    
+    # List pagination (?limit=&cursor=)
+    PAGE_DEFAULT_LIMIT = int(os.environ.get('PAGE_DEFAULT_LIMIT', 500))  # Used when no limit is sent
+    PAGE_MAX_LIMIT = int(os.environ.get('PAGE_MAX_LIMIT', 1000))
+    
+    # Largest POST /api/tasks/batch accepted
+    TASK_BATCH_MAX = int(os.environ.get('TASK_BATCH_MAX', 1000))
+    
+    # Rows fetched and written per chunk by ?stream= admin listings
+    STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 1000))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -0,0 +1,42 @@
+"""Add outbox table for side effects run by the background worker
+
+Revision ID: 0b9e4c2a7d18
+Revises: f5b1d3a7c9e2
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b9e4c2a7d18'
+down_revision = 'f5b1d3a7c9e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables created by db.create_all() on a fresh database already have it
+    if sa.inspect(op.get_bind()).has_table('outbox'):
+        return
+
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('topic', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_status_available_at_id', 'outbox', ['status', 'available_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_outbox_status_available_at_id', table_name='outbox')
+    op.drop_table('outbox')
@@ -0,0 +1,31 @@
+"""Add users.token_version for revoking issued tokens
+
+Revision ID: 437aceb5bcc7
+Revises: a0fedfb53e01
+Create Date: 2026-10-18 02:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '437aceb5bcc7'
+down_revision = 'a0fedfb53e01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables created by db.create_all() on a fresh database already have it
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')]
+    if 'token_version' in columns:
+        return
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
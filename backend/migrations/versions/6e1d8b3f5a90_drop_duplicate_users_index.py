@@ -0,0 +1,26 @@
+"""Drop (department_id, role) index on users, a duplicate of (role, department_id)
+
+Revision ID: 6e1d8b3f5a90
+Revises: 0b9e4c2a7d18
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1d8b3f5a90'
+down_revision = '0b9e4c2a7d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Department stats filter on role and group by department_id, which
+    # ix_users_role_department_id already serves (the planner picks it)
+    op.drop_index('ix_users_department_id_role', table_name='users', if_exists=True)
+
+
+def downgrade():
+    op.create_index('ix_users_department_id_role', 'users', ['department_id', 'role'], unique=False, if_not_exists=True)
@@ -0,0 +1,41 @@
+"""Add composite indexes for role-filtered list queries
+
+Revision ID: 7802190560fb
+Revises:
+Create Date: 2026-10-18 01:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7802190560fb'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - kept in sync with __table_args__ on the models
+INDEXES = [
+    ('ix_tasks_supervisor_id_progress_status', 'tasks', ['supervisor_id', 'progress_status']),
+    ('ix_tasks_assigned_to_progress_status', 'tasks', ['assigned_to', 'progress_status']),
+    ('ix_payments_worker_id_status', 'payments', ['worker_id', 'status']),
+    ('ix_payments_task_id', 'payments', ['task_id']),
+    ('ix_contracts_worker_id', 'contracts', ['worker_id']),
+    ('ix_applications_applicant_id_status', 'applications', ['applicant_id', 'status']),
+    ('ix_applications_job_id_status', 'applications', ['job_id', 'status']),
+    ('ix_jobs_status', 'jobs', ['status']),
+    ('ix_users_role_department_id', 'users', ['role', 'department_id']),
+]
+
+
+def upgrade():
+    # Tables created by db.create_all() on a fresh database already have these
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,34 @@
+"""Add resource_versions table for ETag validators
+
+Revision ID: 8dad42949c8d
+Revises: 437aceb5bcc7
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8dad42949c8d'
+down_revision = '437aceb5bcc7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables created by db.create_all() on a fresh database already have it;
+    # the version rows themselves are created by init_versions() at startup
+    if sa.inspect(op.get_bind()).has_table('resource_versions'):
+        return
+
+    op.create_table(
+        'resource_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('resource_versions')
@@ -0,0 +1,47 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: a0fedfb53e01
+Revises: 7802190560fb
+Create Date: 2026-10-18 01:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a0fedfb53e01'
+down_revision = '7802190560fb'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - kept in sync with __table_args__ on the models
+INDEXES = [
+    ('ix_tasks_created_at_id', 'tasks', ['created_at', 'id']),
+    ('ix_tasks_supervisor_id_created_at_id', 'tasks', ['supervisor_id', 'created_at', 'id']),
+    ('ix_tasks_assigned_to_created_at_id', 'tasks', ['assigned_to', 'created_at', 'id']),
+    ('ix_payments_date_id', 'payments', ['date', 'id']),
+    ('ix_payments_worker_id_date_id', 'payments', ['worker_id', 'date', 'id']),
+    ('ix_contracts_created_at_id', 'contracts', ['created_at', 'id']),
+    ('ix_contracts_worker_id_created_at_id', 'contracts', ['worker_id', 'created_at', 'id']),
+    ('ix_applications_applied_at_id', 'applications', ['applied_at', 'id']),
+    ('ix_applications_applicant_id_applied_at_id', 'applications', ['applicant_id', 'applied_at', 'id']),
+    ('ix_users_created_at_id', 'users', ['created_at', 'id']),
+    ('ix_users_role_created_at_id', 'users', ['role', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+    # Superseded by ix_contracts_worker_id_created_at_id
+    op.drop_index('ix_contracts_worker_id', table_name='contracts', if_exists=True)
+
+
+def downgrade():
+    op.create_index('ix_contracts_worker_id', 'contracts', ['worker_id'], unique=False, if_not_exists=True)
+
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
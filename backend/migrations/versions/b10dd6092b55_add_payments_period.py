@@ -0,0 +1,33 @@
+"""Add payments.period for monthly salary generation
+
+Revision ID: b10dd6092b55
+Revises: 8dad42949c8d
+Create Date: 2026-10-18 04:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b10dd6092b55'
+down_revision = '8dad42949c8d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tables created by db.create_all() on a fresh database already have it
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('payments')]
+    if 'period' not in columns:
+        with op.batch_alter_table('payments') as batch_op:
+            batch_op.add_column(sa.Column('period', sa.String(length=7), nullable=True))
+
+    # One monthly salary payment per worker and period
+    op.create_index('uq_payments_period_worker_id', 'payments', ['period', 'worker_id'], unique=True, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('uq_payments_period_worker_id', table_name='payments', if_exists=True)
+    with op.batch_alter_table('payments') as batch_op:
+        batch_op.drop_column('period')
@@ -0,0 +1,25 @@
+"""Add (department_id, role) index for department stats
+
+Revision ID: c4e8a1f2d7b3
+Revises: b10dd6092b55
+Create Date: 2026-10-18 05:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1f2d7b3'
+down_revision = 'b10dd6092b55'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Department stats group users, their tasks and their payments by department_id
+    op.create_index('ix_users_department_id_role', 'users', ['department_id', 'role'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_department_id_role', table_name='users', if_exists=True)
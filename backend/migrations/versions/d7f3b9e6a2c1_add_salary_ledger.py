@@ -0,0 +1,58 @@
+"""Add salary_ledger and users.balance_cents
+
+Revision ID: d7f3b9e6a2c1
+Revises: c4e8a1f2d7b3
+Create Date: 2026-10-18 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f3b9e6a2c1'
+down_revision = 'c4e8a1f2d7b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    
+    # Tables created by db.create_all() on a fresh database already have them
+    if not inspector.has_table('salary_ledger'):
+        op.create_table(
+            'salary_ledger',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('worker_id', sa.Integer(), nullable=False),
+            sa.Column('amount_cents', sa.BigInteger(), nullable=False),
+            sa.Column('kind', sa.String(length=20), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=True),
+            sa.Column('payment_id', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_salary_ledger_worker_id_created_at_id', 'salary_ledger', ['worker_id', 'created_at', 'id'], unique=False)
+    
+    columns = [column['name'] for column in inspector.get_columns('users')]
+    if 'balance_cents' in columns:
+        return
+    
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('balance_cents', sa.BigInteger(), nullable=False, server_default='0'))
+    
+    # Carry existing float balances over as one opening entry per user
+    op.execute("""
+        UPDATE users SET balance_cents = CAST(ROUND(COALESCE(salary_balance, 0) * 100) AS BIGINT)
+    """)
+    op.execute("""
+        INSERT INTO salary_ledger (worker_id, amount_cents, kind, created_at)
+        SELECT id, balance_cents, 'opening', CURRENT_TIMESTAMP FROM users WHERE balance_cents != 0
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('balance_cents')
+    op.drop_index('ix_salary_ledger_worker_id_created_at_id', table_name='salary_ledger')
+    op.drop_table('salary_ledger')
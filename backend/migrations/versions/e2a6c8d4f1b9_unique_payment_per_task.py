@@ -0,0 +1,35 @@
+"""Make payments.task_id unique (one payment per approved task)
+
+Revision ID: e2a6c8d4f1b9
+Revises: d7f3b9e6a2c1
+Create Date: 2026-10-18 07:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6c8d4f1b9'
+down_revision = 'd7f3b9e6a2c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicates left by the old check-then-insert approval are money records,
+    # so they are reported for an admin to resolve rather than deleted here
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT task_id FROM payments WHERE task_id IS NOT NULL
+        GROUP BY task_id HAVING COUNT(*) > 1
+    """)).scalars().all()
+    if duplicates:
+        raise RuntimeError(f'Tasks with more than one payment, resolve before upgrading: {duplicates}')
+
+    op.create_index('uq_payments_task_id', 'payments', ['task_id'], unique=True, if_not_exists=True)
+    op.drop_index('ix_payments_task_id', table_name='payments', if_exists=True)
+
+
+def downgrade():
+    op.create_index('ix_payments_task_id', 'payments', ['task_id'], unique=False, if_not_exists=True)
+    op.drop_index('uq_payments_task_id', table_name='payments', if_exists=True)
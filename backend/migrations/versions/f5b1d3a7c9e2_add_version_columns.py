@@ -0,0 +1,39 @@
+"""Add version columns for optimistic concurrency
+
+Revision ID: f5b1d3a7c9e2
+Revises: e2a6c8d4f1b9
+Create Date: 2026-10-18 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b1d3a7c9e2'
+down_revision = 'e2a6c8d4f1b9'
+branch_labels = None
+depends_on = None
+
+
+# Tables whose models use version_id_col
+TABLES = ['tasks', 'payments', 'users', 'contracts']
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    
+    for table in TABLES:
+        # Tables created by db.create_all() on a fresh database already have it
+        columns = [column['name'] for column in inspector.get_columns(table)]
+        if 'version' in columns:
+            continue
+        
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version')
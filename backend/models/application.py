@@ -1,8 +1,16 @@
 from utils.db import db
+from sqlalchemy.orm import joinedload
+from models.job import Job
 from datetime import datetime
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_applicant_id_status', 'applicant_id', 'status'),
+        db.Index('ix_applications_job_id_status', 'job_id', 'status'),
+        db.Index('ix_applications_applied_at_id', 'applied_at', 'id'),
+        db.Index('ix_applications_applicant_id_applied_at_id', 'applicant_id', 'applied_at', 'id')
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     applicant_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -11,6 +19,26 @@ class Application(db.Model):
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     reviewed_at = db.Column(db.DateTime, nullable=True)
     
+    @classmethod
+    def listing_query(cls):
+        """Query applications with applicant, job and department joined in for to_dict()"""
+        return cls.query.options(
+            joinedload(cls.applicant),
+            joinedload(cls.job).joinedload(Job.department)
+        )
+    
+    @classmethod
+    def count_by_job(cls, job_ids):
+        """Return {job_id: applications count} from a single GROUP BY query"""
+        if not job_ids:
+            return {}
+        
+        rows = db.session.query(cls.job_id, db.func.count(cls.id)).filter(
+            cls.job_id.in_(job_ids)
+        ).group_by(cls.job_id).all()
+        
+        return dict(rows)
+    
     def to_dict(self):
         """Convert application to dictionary"""
         return {
@@ -22,7 +50,7 @@ class Application(db.Model):
             'job_title': self.job.title if self.job else None,
             'department': self.job.department.name if self.job and self.job.department else None,
             'status': self.status,
-            'applied_at': self.applied_at.isoformat(),
+            'applied_at': self.applied_at.isoformat() if self.applied_at else None,
             'reviewed_at': self.reviewed_at.isoformat() if self.reviewed_at else None
         }
     
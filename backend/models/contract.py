@@ -1,8 +1,13 @@
 from utils.db import db
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 class Contract(db.Model):
     __tablename__ = 'contracts'
+    __table_args__ = (
+        db.Index('ix_contracts_created_at_id', 'created_at', 'id'),
+        db.Index('ix_contracts_worker_id_created_at_id', 'worker_id', 'created_at', 'id')
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     worker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -11,10 +16,21 @@ class Contract(db.Model):
     end_date = db.Column(db.DateTime, nullable=False)
     approved_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, server_default='1')  # Bumped by every update (optimistic concurrency)
+    
+    __mapper_args__ = {'version_id_col': version}
     
     # Relationships
     approver = db.relationship('User', foreign_keys=[approved_by], backref='approved_contracts')
     
+    @classmethod
+    def listing_query(cls):
+        """Query contracts with worker and approver joined in for to_dict()"""
+        return cls.query.options(
+            joinedload(cls.worker),
+            joinedload(cls.approver)
+        )
+    
     def to_dict(self):
         """Convert contract to dictionary"""
         return {
@@ -26,7 +42,8 @@ class Contract(db.Model):
             'end_date': self.end_date.isoformat(),
             'approved_by': self.approved_by,
             'approver_name': self.approver.full_name if self.approver else None,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'version': self.version
         }
     
     def __repr__(self):
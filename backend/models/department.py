@@ -1,4 +1,5 @@
 from utils.db import db
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 class Department(db.Model):
@@ -13,6 +14,11 @@ class Department(db.Model):
     supervisor = db.relationship('User', foreign_keys=[supervisor_id], backref='supervised_department')
     jobs = db.relationship('Job', backref='department', lazy=True, cascade='all, delete-orphan')
     
+    @classmethod
+    def listing_query(cls):
+        """Query departments with supervisor joined in for to_dict()"""
+        return cls.query.options(joinedload(cls.supervisor))
+    
     def to_dict(self):
         """Convert department to dictionary"""
         return {
@@ -1,8 +1,12 @@
 from utils.db import db
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -12,10 +16,18 @@ class Job(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    applications = db.relationship('Application', backref='job', lazy=True, cascade='all, delete-orphan')
+    applications = db.relationship('Application', backref='job', lazy='dynamic', cascade='all, delete-orphan')
     
-    def to_dict(self):
-        """Convert job to dictionary"""
+    @classmethod
+    def listing_query(cls):
+        """Query jobs with department joined in for to_dict()"""
+        return cls.query.options(joinedload(cls.department))
+    
+    def to_dict(self, applications_count=None):
+        """Convert job to dictionary (pass applications_count to skip the COUNT query)"""
+        if applications_count is None:
+            applications_count = self.applications.count()
+        
         return {
             'id': self.id,
             'title': self.title,
@@ -24,7 +36,7 @@ class Job(db.Model):
             'department_name': self.department.name if self.department else None,
             'status': self.status,
             'created_at': self.created_at.isoformat(),
-            'applications_count': len(self.applications)
+            'applications_count': applications_count
         }
     
     def __repr__(self):
@@ -0,0 +1,34 @@
+from utils.db import db
+from datetime import datetime
+
+class LedgerEntry(db.Model):
+    """Append-only salary ledger; users.balance_cents is the running sum per worker"""
+    __tablename__ = 'salary_ledger'
+    __table_args__ = (
+        db.Index('ix_salary_ledger_worker_id_created_at_id', 'worker_id', 'created_at', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # Plain ids rather than foreign keys: entries outlive deleted users, tasks and payments
+    worker_id = db.Column(db.Integer, nullable=False)
+    amount_cents = db.Column(db.BigInteger, nullable=False)  # Positive credit, negative debit
+    kind = db.Column(db.String(20), nullable=False)  # opening, task_approval, task_reversal, salary, payout
+    task_id = db.Column(db.Integer, nullable=True)
+    payment_id = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert ledger entry to dictionary"""
+        return {
+            'id': self.id,
+            'worker_id': self.worker_id,
+            'amount_cents': self.amount_cents,
+            'amount': self.amount_cents / 100,
+            'kind': self.kind,
+            'task_id': self.task_id,
+            'payment_id': self.payment_id,
+            'created_at': self.created_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<LedgerEntry {self.kind} {self.amount_cents} for worker {self.worker_id}>'
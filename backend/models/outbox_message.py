@@ -0,0 +1,22 @@
+from utils.db import db
+from datetime import datetime
+
+class OutboxMessage(db.Model):
+    """Side effect recorded in the same transaction as the write that caused it"""
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        db.Index('ix_outbox_status_available_at_id', 'status', 'available_at', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(50), nullable=False)  # Name of the registered handler, e.g. 'task.approved'
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Not retried before this
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<OutboxMessage {self.id} {self.topic} - {self.status}>'
@@ -1,8 +1,16 @@
 from utils.db import db
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 class Payment(db.Model):
     __tablename__ = 'payments'
+    __table_args__ = (
+        db.Index('ix_payments_worker_id_status', 'worker_id', 'status'),
+        db.Index('uq_payments_task_id', 'task_id', unique=True),  # One payment per approved task
+        db.Index('ix_payments_date_id', 'date', 'id'),
+        db.Index('ix_payments_worker_id_date_id', 'worker_id', 'date', 'id'),
+        db.Index('uq_payments_period_worker_id', 'period', 'worker_id', unique=True)
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     worker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -11,6 +19,18 @@ class Payment(db.Model):
     status = db.Column(db.String(20), nullable=False, default='unpaid')  # unpaid, paid
     date = db.Column(db.DateTime, default=datetime.utcnow)
     paid_at = db.Column(db.DateTime, nullable=True)
+    period = db.Column(db.String(7), nullable=True)  # YYYY-MM for monthly salary payments, one per worker
+    version = db.Column(db.Integer, nullable=False, server_default='1')  # Bumped by every update (optimistic concurrency)
+    
+    __mapper_args__ = {'version_id_col': version}
+    
+    @classmethod
+    def listing_query(cls):
+        """Query payments with worker and task joined in for to_dict()"""
+        return cls.query.options(
+            joinedload(cls.worker),
+            joinedload(cls.task)
+        )
     
     def to_dict(self):
         """Convert payment to dictionary"""
@@ -22,8 +42,10 @@ class Payment(db.Model):
             'task_title': self.task.title if self.task else None,
             'amount': self.amount,
             'status': self.status,
-            'date': self.date.isoformat(),
-            'paid_at': self.paid_at.isoformat() if self.paid_at else None
+            'date': self.date.isoformat() if self.date else None,
+            'paid_at': self.paid_at.isoformat() if self.paid_at else None,
+            'period': self.period,
+            'version': self.version
         }
     
     def __repr__(self):
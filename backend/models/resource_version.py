@@ -0,0 +1,10 @@
+from utils.db import db
+
+class ResourceVersion(db.Model):
+    __tablename__ = 'resource_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)  # Table name, e.g. 'tasks'
+    version = db.Column(db.Integer, nullable=False, default=0)  # Bumped by every write to that table
+    
+    def __repr__(self):
+        return f'<ResourceVersion {self.name} v{self.version}>'
@@ -1,8 +1,16 @@
 from utils.db import db
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        db.Index('ix_tasks_supervisor_id_progress_status', 'supervisor_id', 'progress_status'),
+        db.Index('ix_tasks_assigned_to_progress_status', 'assigned_to', 'progress_status'),
+        db.Index('ix_tasks_created_at_id', 'created_at', 'id'),
+        db.Index('ix_tasks_supervisor_id_created_at_id', 'supervisor_id', 'created_at', 'id'),
+        db.Index('ix_tasks_assigned_to_created_at_id', 'assigned_to', 'created_at', 'id')
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -16,10 +24,21 @@ class Task(db.Model):
     completed_at = db.Column(db.DateTime, nullable=True)
     approved_at = db.Column(db.DateTime, nullable=True)
     supervisor_comment = db.Column(db.Text, nullable=True)  # Comment when approving/denying
+    version = db.Column(db.Integer, nullable=False, server_default='1')  # Bumped by every update (optimistic concurrency)
+    
+    __mapper_args__ = {'version_id_col': version}
     
     # Relationships
     payments = db.relationship('Payment', backref='task', lazy=True)
     
+    @classmethod
+    def listing_query(cls):
+        """Query tasks with worker and supervisor joined in for to_dict()"""
+        return cls.query.options(
+            joinedload(cls.worker),
+            joinedload(cls.supervisor)
+        )
+    
     def to_dict(self):
         """Convert task to dictionary"""
         return {
@@ -33,10 +52,11 @@ class Task(db.Model):
             'progress_status': self.progress_status,
             'start_date': self.start_date.isoformat(),
             'end_date': self.end_date.isoformat(),
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'approved_at': self.approved_at.isoformat() if self.approved_at else None,
-            'supervisor_comment': self.supervisor_comment
+            'supervisor_comment': self.supervisor_comment,
+            'version': self.version
         }
     
     def __repr__(self):
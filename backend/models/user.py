@@ -1,9 +1,15 @@
 from utils.db import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import joinedload
+from utils.passwords import hash_password, verify_password, needs_rehash
 from datetime import datetime
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_role_department_id', 'role', 'department_id'),
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+        db.Index('ix_users_role_created_at_id', 'role', 'created_at', 'id')
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
@@ -12,8 +18,13 @@ class User(db.Model):
     role = db.Column(db.String(20), nullable=False, default='applicant')  # applicant, worker, supervisor, admin
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=True)
     salary = db.Column(db.Float, nullable=True)  # Monthly salary assigned by admin
-    salary_balance = db.Column(db.Float, nullable=True, default=0.0)  # Remaining unpaid salary
+    salary_balance = db.Column(db.Float, nullable=True, default=0.0)  # Remaining unpaid salary (mirror of balance_cents)
+    balance_cents = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')  # Sum of salary_ledger entries
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Bumped to revoke issued tokens
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, server_default='1')  # Bumped by every update (optimistic concurrency)
+    
+    __mapper_args__ = {'version_id_col': version}
     
     # Relationships
     department = db.relationship('Department', foreign_keys=[department_id], backref='members')
@@ -23,13 +34,22 @@ class User(db.Model):
     contracts = db.relationship('Contract', foreign_keys='Contract.worker_id', backref='worker', lazy=True, cascade='all, delete-orphan')
     payments = db.relationship('Payment', foreign_keys='Payment.worker_id', backref='worker', lazy=True, cascade='all, delete-orphan')
     
+    @classmethod
+    def listing_query(cls):
+        """Query users with department joined in for to_dict()"""
+        return cls.query.options(joinedload(cls.department))
+    
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
         """Check if password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """Check if the stored hash uses an outdated method or cost"""
+        return needs_rehash(self.password_hash)
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -42,7 +62,9 @@ class User(db.Model):
             'department_name': self.department.name if self.department else None,
             'salary': self.salary,
             'salary_balance': self.salary_balance,
-            'created_at': self.created_at.isoformat()
+            'balance_cents': self.balance_cents,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'version': self.version
         }
     
     def __repr__(self):
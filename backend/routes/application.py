@@ -3,19 +3,54 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.application import Application
 from models.job import Job
 from models.user import User
+from models.department import Department
 from utils.db import db
-from utils.role_checker import role_required
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag, bump_versions
+from utils.role_checker import role_required, get_current_user
+from utils.idempotency import idempotent
+from utils.jwt_helper import revoke_user_tokens, forget_token_versions_on_commit
+from utils.pagination import keyset_paginate, PaginationError
+from utils.streaming import stream_listing
+from utils.ledger import post_entries, to_cents
+from utils.outbox import enqueue, handler
+from utils.events import publish, publish_many
+from utils.validation import is_id, is_amount
+from sqlalchemy import bindparam, select
 from datetime import datetime
 
 application_bp = Blueprint('application', __name__)
 
+@handler('applications.accepted')
+def reject_other_pending(payload):
+    """Reject every other pending application of the accepted applicants in one UPDATE"""
+    applications = Application.__table__
+    rejected = db.session.execute(
+        applications.update().where(
+            applications.c.applicant_id.in_(payload['applicant_ids']),
+            applications.c.status == 'pending',
+            applications.c.id.notin_(payload['keep_ids'])
+        ).values(status='rejected', reviewed_at=datetime.fromisoformat(payload['reviewed_at']))
+        .returning(applications.c.id, applications.c.applicant_id)
+    ).all()
+    if rejected:
+        bump_versions('applications')
+        publish_many([
+            ([applicant_id], 'application.status', {'application_id': application_id, 'status': 'rejected'})
+            for application_id, applicant_id in rejected
+        ])
+
 @application_bp.route('/applications', methods=['GET'])
 @jwt_required()
 def get_applications():
     """Get applications (filtered by role)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        
+        etag = resource_etag('applications', 'jobs', 'departments', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
         
         if not user:
             return jsonify({
@@ -25,16 +60,29 @@ def get_applications():
         
         # Admin sees all applications
         if user.role == 'admin':
-            applications = Application.query.all()
+            query = Application.listing_query()
+            
+            # Admins can stream the whole table instead of paging through it
+            stream_format = request.args.get('stream')
+            if stream_format:
+                return stream_listing(query, Application.applied_at, Application.id, 'applications', stream_format)
         # Applicants see only their own
         else:
-            applications = Application.query.filter_by(applicant_id=user_id).all()
+            query = Application.listing_query().filter_by(applicant_id=user_id)
         
-        return jsonify({
+        applications, next_cursor = keyset_paginate(query, Application.applied_at, Application.id)
+        
+        return with_etag(jsonify({
             'status': 'success',
-            'applications': [app.to_dict() for app in applications]
-        }), 200
+            'applications': [app.to_dict() for app in applications],
+            'next_cursor': next_cursor
+        }), etag), 200
         
+    except PaginationError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -43,6 +91,7 @@ def get_applications():
 
 @application_bp.route('/applications', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_application():
     """Apply for a job"""
     try:
@@ -116,7 +165,8 @@ def create_application():
 def update_application(application_id):
     """Update application status (admin only)"""
     try:
-        application = Application.query.get(application_id)
+        # Lock the row so the same application can't be accepted twice concurrently
+        application = Application.query.filter_by(id=application_id).with_for_update().first()
         
         if not application:
             return jsonify({
@@ -166,24 +216,34 @@ def update_application(application_id):
                         'message': f'Department already has a supervisor: {existing_supervisor.full_name}'
                     }), 400
             
-            applicant = User.query.get(application.applicant_id)
+            applicant = User.query.filter_by(id=application.applicant_id).with_for_update().first()
             if applicant:
                 # Default to worker role unless specified
                 applicant.role = data.get('role', 'worker')
                 applicant.department_id = data['department_id']
                 applicant.salary = float(data['salary'])
-                applicant.salary_balance = float(data['salary'])  # Initial balance equals salary
                 
-                # Auto-reject all other pending applications from this applicant
-                other_applications = Application.query.filter_by(
-                    applicant_id=application.applicant_id,
-                    status='pending'
-                ).filter(Application.id != application_id).all()
+                # Initial balance equals salary: post the difference as an opening entry
+                post_entries([{
+                    'worker_id': applicant.id,
+                    'amount_cents': to_cents(data['salary']) - applicant.balance_cents,
+                    'kind': 'opening'
+                }])
+                revoke_user_tokens(applicant)  # Old token still says applicant
                 
-                for other_app in other_applications:
-                    other_app.status = 'rejected'
-                    other_app.reviewed_at = datetime.utcnow()
+                # Auto-reject all other pending applications from this applicant (outbox worker)
+                enqueue(
+                    'applications.accepted',
+                    applicant_ids=[application.applicant_id],
+                    keep_ids=[application_id],
+                    reviewed_at=application.reviewed_at.isoformat()
+                )
         
+        publish(
+            [application.applicant_id],
+            'application.status',
+            {'application_id': application.id, 'status': application.status}
+        )
         db.session.commit()
         
         return jsonify({
@@ -199,13 +259,186 @@ def update_application(application_id):
             'message': str(e)
         }), 500
 
+@application_bp.route('/applications/review', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+def review_applications():
+    """Accept or reject many applications at once (admin only)"""
+    try:
+        data = request.get_json()
+        items = data.get('applications') if isinstance(data, dict) else data
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'status': 'error',
+                'message': 'Provide a non-empty list of applications'
+            }), 400
+        
+        valid_statuses = ['pending', 'accepted', 'rejected']
+        valid_roles = ['worker', 'supervisor']
+        ids = {item.get('id') for item in items if isinstance(item, dict) and is_id(item.get('id'))}
+        department_ids = {
+            item.get('department_id') for item in items
+            if isinstance(item, dict) and is_id(item.get('department_id'))
+        }
+        
+        # Everything needed for validation comes from three queries
+        found = dict(db.session.query(Application.id, Application.applicant_id).filter(Application.id.in_(ids)))
+        departments = {
+            department_id for (department_id,) in db.session.query(Department.id).filter(Department.id.in_(department_ids))
+        }
+        supervised_departments = {
+            department_id for (department_id,) in db.session.query(User.department_id).filter(
+                User.role == 'supervisor',
+                User.department_id.isnot(None)
+            )
+        }
+        
+        results = []
+        status_ids = {status: [] for status in valid_statuses}
+        promotions = {}  # applicant_id -> new role, department and salary
+        accepted_ids = []
+        seen_ids = set()  # Applications already reviewed earlier in this list
+        
+        for item in items:
+            application_id = item.get('id') if isinstance(item, dict) else None
+            status = item.get('status') if isinstance(item, dict) else None
+            
+            if not is_id(application_id):
+                results.append({'id': application_id, 'status': 'error', 'message': 'id must be an integer application ID'})
+                continue
+            
+            if application_id not in found:
+                results.append({'id': application_id, 'status': 'error', 'message': 'Application not found'})
+                continue
+            
+            if application_id in seen_ids:
+                results.append({'id': application_id, 'status': 'error', 'message': 'Application listed more than once in this review'})
+                continue
+            
+            if status not in valid_statuses:
+                results.append({'id': application_id, 'status': 'error', 'message': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'})
+                continue
+            
+            if status == 'accepted':
+                if 'salary' not in item or 'department_id' not in item:
+                    results.append({'id': application_id, 'status': 'error', 'message': 'Salary and department are required when accepting application'})
+                    continue
+                
+                if not is_amount(item['salary']):
+                    results.append({'id': application_id, 'status': 'error', 'message': 'salary must be a non-negative number'})
+                    continue
+                
+                if not is_id(item['department_id']) or item['department_id'] not in departments:
+                    results.append({'id': application_id, 'status': 'error', 'message': 'Department not found'})
+                    continue
+                
+                applicant_id = found[application_id]
+                role = item.get('role', 'worker')
+                
+                if role not in valid_roles:
+                    results.append({'id': application_id, 'status': 'error', 'message': f'Invalid role. Must be one of: {", ".join(valid_roles)}'})
+                    continue
+                
+                if applicant_id in promotions:
+                    results.append({'id': application_id, 'status': 'error', 'message': 'Applicant already accepted in this review'})
+                    continue
+                
+                if role == 'supervisor':
+                    if item['department_id'] in supervised_departments:
+                        results.append({'id': application_id, 'status': 'error', 'message': 'Department already has a supervisor'})
+                        continue
+                    supervised_departments.add(item['department_id'])
+                
+                promotions[applicant_id] = {
+                    'applicant_id': applicant_id,
+                    'role': role,
+                    'department_id': item['department_id'],
+                    'salary': float(item['salary'])
+                }
+                accepted_ids.append(application_id)
+            
+            seen_ids.add(application_id)
+            status_ids[status].append(application_id)
+            results.append({'id': application_id, 'status': status})
+        
+        reviewed_at = datetime.utcnow()
+        applications = Application.__table__
+        users = User.__table__
+        
+        # One UPDATE per target status
+        for status, application_ids in status_ids.items():
+            if application_ids:
+                db.session.execute(
+                    applications.update().where(applications.c.id.in_(application_ids))
+                    .values(status=status, reviewed_at=reviewed_at)
+                )
+        
+        if promotions:
+            # One batched UPDATE promotes every accepted applicant and revokes their old tokens
+            db.session.execute(
+                users.update().where(users.c.id == bindparam('applicant_id')).values(
+                    role=bindparam('role'),
+                    department_id=bindparam('department_id'),
+                    salary=bindparam('salary'),
+                    token_version=users.c.token_version + 1,
+                    version=users.c.version + 1
+                ),
+                list(promotions.values())
+            )
+            forget_token_versions_on_commit(*promotions)
+            
+            # Initial balance equals salary: post the difference as an opening entry
+            balances = dict(db.session.execute(
+                select(users.c.id, users.c.balance_cents).where(users.c.id.in_(list(promotions)))
+            ).all())
+            post_entries([
+                {
+                    'worker_id': applicant_id,
+                    'amount_cents': to_cents(promotion['salary']) - balances.get(applicant_id, 0),
+                    'kind': 'opening'
+                }
+                for applicant_id, promotion in promotions.items()
+            ])
+            enqueue(
+                'applications.accepted',
+                applicant_ids=list(promotions),
+                keep_ids=accepted_ids,
+                reviewed_at=reviewed_at.isoformat()
+            )
+        
+        if any(status_ids.values()):
+            bump_versions('applications', 'users')
+        
+        publish_many([
+            ([found[application_id]], 'application.status', {'application_id': application_id, 'status': status})
+            for status, application_ids in status_ids.items()
+            for application_id in application_ids
+        ])
+        
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{sum(len(v) for v in status_ids.values())} of {len(items)} applications reviewed',
+            'auto_rejection_queued': bool(promotions),  # Other pending applications of accepted applicants
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @application_bp.route('/applications/<int:application_id>', methods=['DELETE'])
 @jwt_required()
 def delete_application(application_id):
     """Delete/withdraw application"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         application = Application.query.get(application_id)
         
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from models.user import User
 from utils.db import db
+from utils.role_checker import get_current_user
+from utils.jwt_helper import create_user_token
+from utils.passwords import HashingBusy, busy_response
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -44,6 +47,9 @@ def signup():
             'user': user.to_dict()
         }), 201
         
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -73,8 +79,13 @@ def login():
                 'message': 'Invalid email or password'
             }), 401
         
-        # Create access token (identity must be a string)
-        access_token = create_access_token(identity=str(user.id))
+        # Upgrade hashes made with an older method or cost while we have the password
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+            db.session.commit()
+        
+        # Create access token (identity must be a string, role claims skip DB lookups)
+        access_token = create_user_token(user)
         
         return jsonify({
             'status': 'success',
@@ -89,7 +100,11 @@ def login():
             }
         }), 200
         
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
+        db.session.rollback()
         return jsonify({
             'status': 'error',
             'message': str(e)
@@ -100,8 +115,7 @@ def login():
 def get_profile():
     """Get current user profile"""
     try:
-        user_id = int(get_jwt_identity())  # Convert string to int
-        user = User.query.get(user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({
@@ -3,7 +3,12 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.contract import Contract
 from models.user import User
 from utils.db import db
-from utils.role_checker import role_required
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag
+from utils.role_checker import role_required, get_current_user
+from utils.idempotency import idempotent
+from utils.pagination import keyset_paginate, PaginationError
+from utils.versioning import version_conflict, conflict_response
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import datetime
 
 contract_bp = Blueprint('contract', __name__)
@@ -14,7 +19,12 @@ def get_contracts():
     """Get contracts (filtered by role)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        
+        etag = resource_etag('contracts', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
         
         if not user:
             return jsonify({
@@ -24,18 +34,29 @@ def get_contracts():
         
         # Admin sees all contracts
         if user.role == 'admin':
-            contracts = Contract.query.all()
+            query = Contract.listing_query()
         # Workers see only their own
         elif user.role == 'worker':
-            contracts = Contract.query.filter_by(worker_id=user_id).all()
+            query = Contract.listing_query().filter_by(worker_id=user_id)
         else:
-            contracts = []
+            query = None
         
-        return jsonify({
+        if query is not None:
+            contracts, next_cursor = keyset_paginate(query, Contract.created_at, Contract.id)
+        else:
+            contracts, next_cursor = [], None
+        
+        return with_etag(jsonify({
             'status': 'success',
-            'contracts': [contract.to_dict() for contract in contracts]
-        }), 200
+            'contracts': [contract.to_dict() for contract in contracts],
+            'next_cursor': next_cursor
+        }), etag), 200
         
+    except PaginationError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -48,7 +69,12 @@ def get_contract(contract_id):
     """Get a specific contract"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        
+        etag = resource_etag('contracts', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
         contract = Contract.query.get(contract_id)
         
         if not contract:
@@ -64,10 +90,10 @@ def get_contract(contract_id):
                 'message': 'Access denied'
             }), 403
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'contract': contract.to_dict()
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -78,6 +104,7 @@ def get_contract(contract_id):
 @contract_bp.route('/contracts', methods=['POST'])
 @jwt_required()
 @role_required('admin')
+@idempotent
 def create_contract():
     """Create a new contract (admin only)"""
     try:
@@ -153,6 +180,11 @@ def update_contract(contract_id):
         
         data = request.get_json()
         
+        # Reject edits based on a version someone else has since changed
+        conflict = version_conflict(contract, data)
+        if conflict:
+            return conflict
+        
         # Update fields
         if 'file_url' in data:
             contract.file_url = data['file_url']
@@ -171,6 +203,10 @@ def update_contract(contract_id):
             'contract': contract.to_dict()
         }), 200
         
+    except StaleDataError:
+        # Another request updated the row between our read and our write
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
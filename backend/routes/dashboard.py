@@ -0,0 +1,123 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func
+from models.task import Task
+from models.payment import Payment
+from models.application import Application
+from models.job import Job
+from models.user import User
+from utils.db import db
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag
+from utils.role_checker import get_current_user
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+RECENT_LIMIT = 5
+
+def counts_by(column, *criteria):
+    """{value: count} for one column, from a single GROUP BY query"""
+    return dict(db.session.query(column, func.count()).filter(*criteria).group_by(column).all())
+
+def payment_totals(*criteria):
+    """Count and sum of unpaid and paid payments, from a single FILTER aggregate query"""
+    unpaid = Payment.status == 'unpaid'
+    paid = Payment.status == 'paid'
+    row = db.session.query(
+        func.count(Payment.id).filter(unpaid),
+        func.coalesce(func.sum(Payment.amount).filter(unpaid), 0.0),
+        func.count(Payment.id).filter(paid),
+        func.coalesce(func.sum(Payment.amount).filter(paid), 0.0)
+    ).filter(*criteria).one()
+    
+    return {
+        'unpaid_count': row[0],
+        'unpaid_total': row[1],
+        'paid_count': row[2],
+        'paid_total': row[3]
+    }
+
+def recent_tasks(*criteria):
+    tasks = Task.listing_query().filter(*criteria).order_by(Task.created_at.desc(), Task.id.desc()).limit(RECENT_LIMIT)
+    return [task.to_dict() for task in tasks]
+
+def recent_payments(*criteria):
+    payments = Payment.listing_query().filter(*criteria).order_by(Payment.date.desc(), Payment.id.desc()).limit(RECENT_LIMIT)
+    return [payment.to_dict() for payment in payments]
+
+def recent_applications(*criteria):
+    applications = Application.listing_query().filter(*criteria).order_by(Application.applied_at.desc(), Application.id.desc()).limit(RECENT_LIMIT)
+    return [application.to_dict() for application in applications]
+
+@dashboard_bp.route('/dashboard/summary', methods=['GET'])
+@jwt_required()
+def get_dashboard_summary():
+    """Counts, totals and recent items for the caller's dashboard"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        etag = resource_etag('tasks', 'payments', 'applications', 'jobs', 'departments', 'users', 'salary_ledger', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
+        
+        if not user:
+            return jsonify({
+                'status': 'error',
+                'message': 'User not found'
+            }), 404
+        
+        if user.role == 'admin':
+            tasks_by_status = counts_by(Task.progress_status)
+            summary = {
+                'tasks_by_status': tasks_by_status,
+                'pending_approvals': tasks_by_status.get('completed', 0),
+                'applications_by_status': counts_by(Application.status),
+                'users_by_role': counts_by(User.role),
+                'jobs_by_status': counts_by(Job.status),
+                'payments': payment_totals(),
+                'recent_tasks': recent_tasks(),
+                'recent_applications': recent_applications()
+            }
+            
+        elif user.role == 'supervisor':
+            tasks_by_status = counts_by(Task.progress_status, Task.supervisor_id == user_id)
+            summary = {
+                'tasks_by_status': tasks_by_status,
+                'pending_approvals': tasks_by_status.get('completed', 0),
+                'department_workers': db.session.query(func.count(User.id)).filter(
+                    User.role == 'worker',
+                    User.department_id == user.department_id
+                ).scalar() if user.department_id else 0,
+                'payments': payment_totals(Payment.worker_id == user_id),
+                'salary_balance': user.salary_balance,
+                'recent_tasks': recent_tasks(Task.supervisor_id == user_id)
+            }
+            
+        elif user.role == 'worker':
+            summary = {
+                'tasks_by_status': counts_by(Task.progress_status, Task.assigned_to == user_id),
+                'payments': payment_totals(Payment.worker_id == user_id),
+                'salary_balance': user.salary_balance,
+                'recent_tasks': recent_tasks(Task.assigned_to == user_id),
+                'recent_payments': recent_payments(Payment.worker_id == user_id)
+            }
+            
+        else:
+            summary = {
+                'applications_by_status': counts_by(Application.status, Application.applicant_id == user_id),
+                'open_jobs': db.session.query(func.count(Job.id)).filter(Job.status == 'open').scalar(),
+                'recent_applications': recent_applications(Application.applicant_id == user_id)
+            }
+        
+        return with_etag(jsonify({
+            'status': 'success',
+            'role': user.role,
+            'summary': summary
+        }), etag), 200
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
@@ -2,8 +2,14 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.department import Department
 from models.user import User
+from models.task import Task
+from models.payment import Payment
 from utils.db import db
-from utils.role_checker import role_required
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag
+from utils.cache import cache
+from utils.role_checker import role_required, get_current_user
+from utils.sql import seconds_between, median_by
+from sqlalchemy import select, func
 
 department_bp = Blueprint('department', __name__)
 
@@ -11,12 +17,19 @@ department_bp = Blueprint('department', __name__)
 def get_departments():
     """Get all departments"""
     try:
-        departments = Department.query.all()
+        etag = resource_etag('departments', 'users')
+        if etag_matches(etag):
+            return not_modified(etag)
         
-        return jsonify({
-            'status': 'success',
-            'departments': [dept.to_dict() for dept in departments]
-        }), 200
+        def build():
+            departments = Department.listing_query().all()
+            
+            return jsonify({
+                'status': 'success',
+                'departments': [dept.to_dict() for dept in departments]
+            })
+        
+        return with_etag(cache.cached_response(f'departments:{etag}', build), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -28,6 +41,10 @@ def get_departments():
 def get_department(department_id):
     """Get a specific department"""
     try:
+        etag = resource_etag('departments', 'users')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         department = Department.query.get(department_id)
         
         if not department:
@@ -36,10 +53,10 @@ def get_department(department_id):
                 'message': 'Department not found'
             }), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'department': department.to_dict()
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -202,6 +219,10 @@ def delete_department(department_id):
 def get_department_workers(department_id):
     """Get all workers in a department"""
     try:
+        etag = resource_etag('departments', 'users', 'salary_ledger')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         department = Department.query.get(department_id)
         
         if not department:
@@ -212,10 +233,164 @@ def get_department_workers(department_id):
         
         workers = User.query.filter_by(department_id=department_id, role='worker').all()
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'workers': [worker.to_dict() for worker in workers]
-        }), 200
+        }), etag), 200
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+def department_stats(department_ids):
+    """Headcount, task throughput and payment totals per department, aggregated in SQL.
+
+    Every figure comes from one GROUP BY department_id query, so the number of
+    queries is the same for one department or all of them.
+    """
+    users = User.__table__
+    tasks = Task.__table__
+    payments = Payment.__table__
+    in_departments = users.c.department_id.in_(department_ids)
+    tasks_by_worker = tasks.join(users, tasks.c.assigned_to == users.c.id)
+    payments_by_worker = payments.join(users, payments.c.worker_id == users.c.id)
+
+    stats = {
+        department_id: {
+            'headcount': {},
+            'tasks_by_status': {},
+            'median_completion_seconds': None,
+            'median_approval_seconds': None,
+            'payments': {'unpaid_count': 0, 'unpaid_total': 0.0, 'paid_count': 0, 'paid_total': 0.0}
+        }
+        for department_id in department_ids
+    }
+
+    headcount = db.session.execute(
+        select(users.c.department_id, users.c.role, func.count())
+        .where(in_departments)
+        .group_by(users.c.department_id, users.c.role)
+    )
+    for department_id, role, count in headcount:
+        stats[department_id]['headcount'][role] = count
+
+    tasks_by_status = db.session.execute(
+        select(users.c.department_id, tasks.c.progress_status, func.count())
+        .select_from(tasks_by_worker)
+        .where(in_departments)
+        .group_by(users.c.department_id, tasks.c.progress_status)
+    )
+    for department_id, progress_status, count in tasks_by_status:
+        stats[department_id]['tasks_by_status'][progress_status] = count
+
+    # Completion: created -> completed; approval: completed -> approved/denied
+    completion = db.session.execute(median_by(
+        users.c.department_id,
+        seconds_between(tasks.c.created_at, tasks.c.completed_at),
+        tasks_by_worker,
+        in_departments,
+        tasks.c.completed_at.isnot(None)
+    ))
+    for department_id, seconds in completion:
+        stats[department_id]['median_completion_seconds'] = seconds
+
+    approval = db.session.execute(median_by(
+        users.c.department_id,
+        seconds_between(tasks.c.completed_at, tasks.c.approved_at),
+        tasks_by_worker,
+        in_departments,
+        tasks.c.completed_at.isnot(None),
+        tasks.c.approved_at.isnot(None)
+    ))
+    for department_id, seconds in approval:
+        stats[department_id]['median_approval_seconds'] = seconds
+
+    unpaid = payments.c.status == 'unpaid'
+    paid = payments.c.status == 'paid'
+    totals = db.session.execute(
+        select(
+            users.c.department_id,
+            func.count().filter(unpaid),
+            func.coalesce(func.sum(payments.c.amount).filter(unpaid), 0.0),
+            func.count().filter(paid),
+            func.coalesce(func.sum(payments.c.amount).filter(paid), 0.0)
+        )
+        .select_from(payments_by_worker)
+        .where(in_departments)
+        .group_by(users.c.department_id)
+    )
+    for department_id, unpaid_count, unpaid_total, paid_count, paid_total in totals:
+        stats[department_id]['payments'] = {
+            'unpaid_count': unpaid_count,
+            'unpaid_total': unpaid_total,
+            'paid_count': paid_count,
+            'paid_total': paid_total
+        }
+
+    return stats
+
+@department_bp.route('/departments/stats', methods=['GET'])
+@jwt_required()
+@role_required('admin')
+def get_all_department_stats():
+    """Get stats for every department (admin only)"""
+    try:
+        etag = resource_etag('departments', 'users', 'tasks', 'payments')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        departments = db.session.execute(select(Department.id, Department.name).order_by(Department.id)).all()
+        stats = department_stats([department.id for department in departments])
+        
+        return with_etag(jsonify({
+            'status': 'success',
+            'departments': [
+                {'department_id': department.id, 'department_name': department.name, **stats[department.id]}
+                for department in departments
+            ]
+        }), etag), 200
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@department_bp.route('/departments/<int:department_id>/stats', methods=['GET'])
+@jwt_required()
+@role_required('admin', 'supervisor')
+def get_department_stats(department_id):
+    """Get stats for one department (admin, or the department's supervisor)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        etag = resource_etag('departments', 'users', 'tasks', 'payments', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        department = Department.query.get(department_id)
+        
+        if not department:
+            return jsonify({
+                'status': 'error',
+                'message': 'Department not found'
+            }), 404
+        
+        user = get_current_user()
+        if user.role == 'supervisor' and department.supervisor_id != user_id and user.department_id != department_id:
+            return jsonify({
+                'status': 'error',
+                'message': 'Access denied. You can only view stats for your own department.'
+            }), 403
+        
+        return with_etag(jsonify({
+            'status': 'success',
+            'department_id': department.id,
+            'department_name': department.name,
+            **department_stats([department_id])[department_id]
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
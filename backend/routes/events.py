@@ -0,0 +1,58 @@
+from flask import Blueprint, Response, request, jsonify, current_app, json
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity, get_jwt_request_location
+from utils.events import broker, streams_supported
+from utils.jwt_helper import create_stream_token
+import queue
+
+events_bp = Blueprint('events', __name__)
+
+@events_bp.route('/events/token', methods=['POST'])
+@jwt_required()
+def get_stream_token():
+    """Short-lived token for opening the event stream with ?token=<token>"""
+    return jsonify({
+        'status': 'success',
+        'token': create_stream_token(int(get_jwt_identity())),
+        'expires_in': current_app.config['EVENTS_TOKEN_SECONDS']
+    }), 200
+
+@events_bp.route('/events', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])  # EventSource can't set headers: ?token=<stream token>
+def stream_events():
+    """Server-Sent Events stream of task and application changes for the caller"""
+    if get_jwt_request_location() == 'query_string' and get_jwt().get('scope') != 'events':
+        return jsonify({
+            'status': 'error',
+            'message': 'Use a stream token from POST /api/events/token in the query string'
+        }), 401
+    
+    if not streams_supported(request.environ):
+        return jsonify({
+            'status': 'error',
+            'message': 'Live events need an async worker (gunicorn -k gevent)'
+        }), 503
+    
+    user_id = int(get_jwt_identity())
+    keepalive = current_app.config['EVENTS_KEEPALIVE_SECONDS']
+    broker.ensure_listener()
+    subscriber = broker.subscribe(user_id)
+    
+    # Runs after the request context (and its database session) is gone, so an
+    # idle stream holds no pooled connection
+    def generate():
+        try:
+            yield f'retry: {keepalive * 1000}\n\n'
+            while True:
+                try:
+                    message = subscriber.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f'id: {message["id"]}\nevent: {message["event"]}\ndata: {json.dumps(message["data"])}\n\n'
+        finally:
+            broker.unsubscribe(user_id, subscriber)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Don't let a proxy hold events back
+    })
@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.job import Job
+from models.application import Application
 from models.department import Department
 from utils.db import db
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag
+from utils.cache import cache
 from utils.role_checker import role_required
 
 job_bp = Blueprint('job', __name__)
@@ -13,15 +16,25 @@ def get_jobs():
     try:
         status = request.args.get('status', 'open')
         
-        if status == 'all':
-            jobs = Job.query.all()
-        else:
-            jobs = Job.query.filter_by(status=status).all()
+        etag = resource_etag('jobs', 'departments', 'applications')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        def build():
+            if status == 'all':
+                jobs = Job.listing_query().all()
+            else:
+                jobs = Job.listing_query().filter_by(status=status).all()
+            
+            # Count applications for every listed job in one aggregate query
+            counts = Application.count_by_job([job.id for job in jobs])
+            
+            return jsonify({
+                'status': 'success',
+                'jobs': [job.to_dict(applications_count=counts.get(job.id, 0)) for job in jobs]
+            })
         
-        return jsonify({
-            'status': 'success',
-            'jobs': [job.to_dict() for job in jobs]
-        }), 200
+        return with_etag(cache.cached_response(f'jobs:{etag}', build), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -33,6 +46,10 @@ def get_jobs():
 def get_job(job_id):
     """Get a specific job"""
     try:
+        etag = resource_etag('jobs', 'departments', 'applications')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         job = Job.query.get(job_id)
         
         if not job:
@@ -41,10 +58,10 @@ def get_job(job_id):
                 'message': 'Job not found'
             }), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'job': job.to_dict()
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -0,0 +1,77 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models.ledger_entry import LedgerEntry
+from models.user import User
+from utils.db import db
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag
+from utils.role_checker import get_current_user
+from datetime import datetime
+
+ledger_bp = Blueprint('ledger', __name__)
+
+@ledger_bp.route('/ledger/statement', methods=['GET'])
+@jwt_required()
+def get_statement():
+    """Salary ledger entries for one worker and period, with the current balance"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        etag = resource_etag('salary_ledger', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
+        
+        # Admins can read anyone's statement, everyone else only their own
+        worker_id = request.args.get('worker_id', type=int) or user_id
+        if worker_id != user_id and user.role != 'admin':
+            return jsonify({
+                'status': 'error',
+                'message': 'Access denied'
+            }), 403
+        
+        period = request.args.get('period') or datetime.utcnow().strftime('%Y-%m')
+        try:
+            start = datetime.strptime(period, '%Y-%m')
+        except ValueError:
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid period. Use YYYY-MM'
+            }), 400
+        end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+        
+        # O(1) balance lookup from the materialized running total
+        balance_cents = db.session.query(User.balance_cents).filter(User.id == worker_id).scalar()
+        if balance_cents is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'User not found'
+            }), 404
+        
+        # One range scan of ix_salary_ledger_worker_id_created_at_id
+        entries = LedgerEntry.query.filter(
+            LedgerEntry.worker_id == worker_id,
+            LedgerEntry.created_at >= start,
+            LedgerEntry.created_at < end
+        ).order_by(LedgerEntry.created_at, LedgerEntry.id).all()
+        
+        credits_cents = sum(entry.amount_cents for entry in entries if entry.amount_cents > 0)
+        debits_cents = sum(entry.amount_cents for entry in entries if entry.amount_cents < 0)
+        
+        return with_etag(jsonify({
+            'status': 'success',
+            'statement': {
+                'worker_id': worker_id,
+                'period': start.strftime('%Y-%m'),
+                'balance_cents': balance_cents,
+                'credits_cents': credits_cents,
+                'debits_cents': debits_cents,
+                'entries': [entry.to_dict() for entry in entries]
+            }
+        }), etag), 200
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
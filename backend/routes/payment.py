@@ -4,7 +4,18 @@ from models.payment import Payment
 from models.user import User
 from models.task import Task
 from utils.db import db
-from utils.role_checker import role_required
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag, bump_versions
+from utils.role_checker import role_required, get_current_user
+from utils.idempotency import idempotent
+from utils.pagination import keyset_paginate, PaginationError
+from utils.streaming import stream_listing
+from utils.ledger import post_entries, to_cents
+from utils.versioning import version_conflict, conflict_response
+from utils.validation import is_id
+from sqlalchemy import select, update, func, exists, insert, literal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from collections import defaultdict
 from datetime import datetime
 
 payment_bp = Blueprint('payment', __name__)
@@ -15,7 +26,12 @@ def get_payments():
     """Get payments (filtered by role)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        
+        etag = resource_etag('payments', 'tasks', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
         
         if not user:
             return jsonify({
@@ -25,18 +41,34 @@ def get_payments():
         
         # Admin sees all payments
         if user.role == 'admin':
-            payments = Payment.query.all()
+            query = Payment.listing_query()
+            
+            # Admins can stream the whole table instead of paging through it
+            stream_format = request.args.get('stream')
+            if stream_format:
+                return stream_listing(query, Payment.date, Payment.id, 'payments', stream_format)
         # Workers and supervisors see only their own
         elif user.role in ['worker', 'supervisor']:
-            payments = Payment.query.filter_by(worker_id=user_id).all()
+            query = Payment.listing_query().filter_by(worker_id=user_id)
         else:
-            payments = []
+            query = None
         
-        return jsonify({
+        if query is not None:
+            payments, next_cursor = keyset_paginate(query, Payment.date, Payment.id)
+        else:
+            payments, next_cursor = [], None
+        
+        return with_etag(jsonify({
             'status': 'success',
-            'payments': [payment.to_dict() for payment in payments]
-        }), 200
+            'payments': [payment.to_dict() for payment in payments],
+            'next_cursor': next_cursor
+        }), etag), 200
         
+    except PaginationError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -49,7 +81,12 @@ def get_payment(payment_id):
     """Get a specific payment"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        
+        etag = resource_etag('payments', 'tasks', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
         payment = Payment.query.get(payment_id)
         
         if not payment:
@@ -65,10 +102,10 @@ def get_payment(payment_id):
                 'message': 'Access denied'
             }), 403
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'payment': payment.to_dict()
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -79,6 +116,7 @@ def get_payment(payment_id):
 @payment_bp.route('/payments', methods=['POST'])
 @jwt_required()
 @role_required('admin')
+@idempotent
 def create_payment():
     """Create a new payment record (admin only)"""
     try:
@@ -127,6 +165,207 @@ def create_payment():
             'payment': payment.to_dict()
         }), 201
         
+    except IntegrityError:
+        # uq_payments_task_id: the task already has its payment
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': 'A payment already exists for this task'
+        }), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@payment_bp.route('/payments/payroll-run', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+def run_payroll():
+    """Mark every unpaid payment matching a filter as paid (admin only)"""
+    try:
+        data = request.get_json() or {}
+        payments = Payment.__table__
+        users = User.__table__
+        
+        conditions = [payments.c.status == 'unpaid']
+        
+        if data.get('payment_ids') is not None:
+            if not isinstance(data['payment_ids'], list) or not data['payment_ids'] or not all(is_id(i) for i in data['payment_ids']):
+                return jsonify({
+                    'status': 'error',
+                    'message': 'payment_ids must be a non-empty list of integer payment IDs'
+                }), 400
+            conditions.append(payments.c.id.in_(data['payment_ids']))
+        if data.get('department_id') is not None:
+            if not is_id(data['department_id']):
+                return jsonify({
+                    'status': 'error',
+                    'message': 'department_id must be an integer department ID'
+                }), 400
+            conditions.append(payments.c.worker_id.in_(
+                select(users.c.id).where(users.c.department_id == data['department_id'])
+            ))
+        try:
+            if data.get('date_from'):
+                conditions.append(payments.c.date >= datetime.fromisoformat(data['date_from'].replace('Z', '+00:00')))
+            if data.get('date_to'):
+                conditions.append(payments.c.date <= datetime.fromisoformat(data['date_to'].replace('Z', '+00:00')))
+        except (ValueError, AttributeError):
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'
+            }), 400
+        
+        if len(conditions) == 1:
+            return jsonify({
+                'status': 'error',
+                'message': 'Provide at least one of: payment_ids, department_id, date_from, date_to'
+            }), 400
+        
+        paid_at = datetime.utcnow()
+        
+        # Flip only rows that are still unpaid; RETURNING tells us exactly which
+        # ones this run paid, so a rerun (or a concurrent run) deducts nothing twice
+        paid_rows = db.session.execute(
+            payments.update().where(*conditions).values(status='paid', paid_at=paid_at, version=payments.c.version + 1)
+            .returning(payments.c.id, payments.c.worker_id, payments.c.amount)
+        ).all()
+        
+        totals = defaultdict(float)
+        for payment_id, worker_id, amount in paid_rows:
+            totals[worker_id] += amount
+        
+        # One payout entry per payment; balances are deducted in one batched UPDATE
+        if paid_rows:
+            post_entries([
+                {'worker_id': worker_id, 'amount_cents': -to_cents(amount), 'kind': 'payout', 'payment_id': payment_id}
+                for payment_id, worker_id, amount in paid_rows
+            ])
+            bump_versions('payments')
+        
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(paid_rows)} payments marked as paid',
+            'run': {
+                'paid_at': paid_at.isoformat(),
+                'payments_paid': len(paid_rows),
+                'workers_paid': len(totals),
+                'total_amount': sum(totals.values(), 0.0)
+            }
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@payment_bp.route('/payments/generate-monthly', methods=['POST'])
+@jwt_required()
+@role_required('admin')
+def generate_monthly_payments():
+    """Create one month's salary payment for every salaried worker and supervisor (admin only)"""
+    try:
+        data = request.get_json() or {}
+        period = data.get('period') or datetime.utcnow().strftime('%Y-%m')
+        department_id = data.get('department_id')
+        dry_run = bool(data.get('dry_run'))
+        
+        try:
+            period = datetime.strptime(period, '%Y-%m').strftime('%Y-%m')
+        except (ValueError, TypeError):
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid period. Use YYYY-MM'
+            }), 400
+        
+        payments = Payment.__table__
+        users = User.__table__
+        
+        eligible = [
+            users.c.role.in_(['worker', 'supervisor']),
+            users.c.salary > 0
+        ]
+        if department_id:
+            eligible.append(users.c.department_id == department_id)
+        
+        # Staff who already have a salary payment for this period are skipped
+        not_generated = ~exists().where(
+            payments.c.worker_id == users.c.id,
+            payments.c.period == period
+        )
+        
+        if dry_run:
+            breakdown = db.session.execute(
+                select(users.c.department_id, func.count(users.c.id), func.sum(users.c.salary))
+                .where(*eligible, not_generated)
+                .group_by(users.c.department_id)
+            ).all()
+            already_generated = db.session.scalar(
+                select(func.count(users.c.id)).where(*eligible, ~not_generated)
+            )
+            
+            return jsonify({
+                'status': 'success',
+                'message': f'Dry run for {period}: no payments created',
+                'preview': {
+                    'period': period,
+                    'payments_to_create': sum(row[1] for row in breakdown),
+                    'total_amount': sum((row[2] or 0.0 for row in breakdown), 0.0),
+                    'already_generated': already_generated,
+                    'departments': [
+                        {'department_id': row[0], 'staff': row[1], 'total_amount': row[2]}
+                        for row in breakdown
+                    ]
+                }
+            }), 200
+        
+        generated_at = datetime.utcnow()
+        
+        # INSERT ... SELECT builds every payment in the database in one statement
+        created_rows = db.session.execute(
+            insert(payments).from_select(
+                ['worker_id', 'amount', 'status', 'date', 'period'],
+                select(
+                    users.c.id,
+                    users.c.salary,
+                    literal('unpaid'),
+                    literal(generated_at, db.DateTime),
+                    literal(period)
+                ).where(*eligible, not_generated)
+            ).returning(payments.c.id, payments.c.worker_id, payments.c.amount)
+        ).all()
+        created = len(created_rows)
+        
+        # Credit the new payments to the salary balances, as task approval does
+        if created:
+            post_entries([
+                {'worker_id': worker_id, 'amount_cents': to_cents(amount), 'kind': 'salary', 'payment_id': payment_id}
+                for payment_id, worker_id, amount in created_rows
+            ])
+            bump_versions('payments')
+        
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{created} salary payments created for {period}',
+            'period': period,
+            'created': created
+        }), 201
+        
+    except IntegrityError:
+        # uq_payments_period_worker_id caught a concurrent run for the same period
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': 'Salary payments for this period are already being generated'
+        }), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -150,6 +389,11 @@ def update_payment(payment_id):
         
         data = request.get_json()
         
+        # Reject edits based on a version someone else has since changed
+        conflict = version_conflict(payment, data)
+        if conflict:
+            return conflict
+        
         # Update amount if provided (before marking as paid)
         if 'amount' in data:
             payment.amount = float(data['amount'])
@@ -164,13 +408,21 @@ def update_payment(payment_id):
             
             # When marking as paid, deduct from worker's salary balance
             if data['status'] == 'paid' and payment.status != 'paid':
-                worker = User.query.get(payment.worker_id)
-                if worker:
-                    # Deduct payment amount from salary balance
-                    if worker.salary_balance is None:
-                        worker.salary_balance = worker.salary if worker.salary else 0.0
-                    worker.salary_balance -= payment.amount
-                    payment.paid_at = datetime.utcnow()
+                # Flip only a row that is still unpaid, so of two concurrent
+                # requests exactly one deducts
+                claimed = db.session.execute(
+                    update(Payment).where(Payment.id == payment.id, Payment.status != 'paid')
+                    .values(status='paid', paid_at=datetime.utcnow(), version=Payment.version + 1)
+                ).rowcount
+                if claimed:
+                    # Deduct payment amount from salary balance through the ledger
+                    post_entries([{
+                        'worker_id': payment.worker_id,
+                        'amount_cents': -to_cents(payment.amount),
+                        'kind': 'payout',
+                        'payment_id': payment.id
+                    }])
+                bump_versions('payments')
             
             payment.status = data['status']
         
@@ -182,6 +434,10 @@ def update_payment(payment_id):
             'payment': payment.to_dict()
         }), 200
         
+    except StaleDataError:
+        # Another request updated the row between our read and our write
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
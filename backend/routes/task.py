@@ -1,10 +1,20 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.task import Task
 from models.user import User
-from models.payment import Payment
 from utils.db import db
-from utils.role_checker import role_required
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag, bump_versions
+from utils.role_checker import role_required, get_current_user
+from utils.idempotency import idempotent
+from utils.events import publish, publish_many
+from utils.pagination import keyset_paginate, PaginationError
+from utils.streaming import stream_listing
+from utils.task_state import transition_task, TransitionError, STATUSES
+from utils.versioning import version_conflict, conflict_response
+from utils.validation import is_id
+from sqlalchemy import insert
+from sqlalchemy.orm.exc import StaleDataError
+from collections import defaultdict
 from datetime import datetime
 
 task_bp = Blueprint('task', __name__)
@@ -15,7 +25,12 @@ def get_tasks():
     """Get tasks (filtered by role)"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        
+        etag = resource_etag('tasks', 'users', scope=user_id)
+        if etag_matches(etag):
+            return not_modified(etag)
+        
+        user = get_current_user()
         
         if not user:
             return jsonify({
@@ -25,21 +40,37 @@ def get_tasks():
         
         # Admin sees all tasks
         if user.role == 'admin':
-            tasks = Task.query.all()
+            query = Task.listing_query()
+            
+            # Admins can stream the whole table instead of paging through it
+            stream_format = request.args.get('stream')
+            if stream_format:
+                return stream_listing(query, Task.created_at, Task.id, 'tasks', stream_format)
         # Supervisor sees tasks they supervise
         elif user.role == 'supervisor':
-            tasks = Task.query.filter_by(supervisor_id=user_id).all()
+            query = Task.listing_query().filter_by(supervisor_id=user_id)
         # Worker sees tasks assigned to them
         elif user.role == 'worker':
-            tasks = Task.query.filter_by(assigned_to=user_id).all()
+            query = Task.listing_query().filter_by(assigned_to=user_id)
         else:
-            tasks = []
+            query = None
         
-        return jsonify({
+        if query is not None:
+            tasks, next_cursor = keyset_paginate(query, Task.created_at, Task.id)
+        else:
+            tasks, next_cursor = [], None
+        
+        return with_etag(jsonify({
             'status': 'success',
-            'tasks': [task.to_dict() for task in tasks]
-        }), 200
+            'tasks': [task.to_dict() for task in tasks],
+            'next_cursor': next_cursor
+        }), etag), 200
         
+    except PaginationError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -51,6 +82,10 @@ def get_tasks():
 def get_task(task_id):
     """Get a specific task"""
     try:
+        etag = resource_etag('tasks', 'users')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         task = Task.query.get(task_id)
         
         if not task:
@@ -59,10 +94,10 @@ def get_task(task_id):
                 'message': 'Task not found'
             }), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'task': task.to_dict()
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -73,6 +108,7 @@ def get_task(task_id):
 @task_bp.route('/tasks', methods=['POST'])
 @jwt_required()
 @role_required('supervisor', 'admin')
+@idempotent
 def create_task():
     """Create a new task (supervisor or admin)"""
     try:
@@ -118,6 +154,8 @@ def create_task():
         )
         
         db.session.add(task)
+        db.session.flush()
+        publish([task.assigned_to], 'task.assigned', {'task_ids': [task.id]})
         db.session.commit()
         
         return jsonify({
@@ -133,13 +171,136 @@ def create_task():
             'message': str(e)
         }), 500
 
+@task_bp.route('/tasks/batch', methods=['POST'])
+@jwt_required()
+@role_required('supervisor', 'admin')
+@idempotent
+def create_tasks_batch():
+    """Create many tasks in one transaction (supervisor or admin)"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json()
+        items = data.get('tasks') if isinstance(data, dict) else data
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({
+                'status': 'error',
+                'message': 'Provide a non-empty list of tasks'
+            }), 400
+        
+        max_items = current_app.config['TASK_BATCH_MAX']
+        if len(items) > max_items:
+            return jsonify({
+                'status': 'error',
+                'message': f'At most {max_items} tasks can be created per batch'
+            }), 400
+        
+        # Verify every referenced worker in a single query
+        worker_ids = {
+            item['assigned_to'] for item in items
+            if isinstance(item, dict) and is_id(item.get('assigned_to'))
+        }
+        valid_workers = {
+            worker_id for (worker_id,) in db.session.query(User.id).filter(
+                User.id.in_(worker_ids),
+                User.role == 'worker'
+            )
+        }
+        
+        results = [None] * len(items)
+        rows = []
+        row_indexes = []
+        required_fields = ['title', 'description', 'assigned_to', 'start_date', 'end_date']
+        
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {'index': index, 'status': 'error', 'message': 'Task must be an object'}
+                continue
+            
+            missing = [field for field in required_fields if field not in item]
+            if missing:
+                results[index] = {'index': index, 'status': 'error', 'message': f'Missing required field: {missing[0]}'}
+                continue
+            
+            if not isinstance(item['title'], str) or not item['title'].strip() or len(item['title']) > 200:
+                results[index] = {'index': index, 'status': 'error', 'message': 'title must be a non-empty string of at most 200 characters'}
+                continue
+            
+            if not isinstance(item['description'], str):
+                results[index] = {'index': index, 'status': 'error', 'message': 'description must be a string'}
+                continue
+            
+            if not is_id(item['assigned_to']):
+                results[index] = {'index': index, 'status': 'error', 'message': 'assigned_to must be an integer worker ID'}
+                continue
+            
+            if item['assigned_to'] not in valid_workers:
+                results[index] = {'index': index, 'status': 'error', 'message': 'Invalid worker ID'}
+                continue
+            
+            try:
+                start_date = datetime.fromisoformat(item['start_date'].replace('Z', '+00:00'))
+                end_date = datetime.fromisoformat(item['end_date'].replace('Z', '+00:00'))
+            except (ValueError, AttributeError):
+                results[index] = {'index': index, 'status': 'error', 'message': 'Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'}
+                continue
+            
+            rows.append({
+                'title': item['title'],
+                'description': item['description'],
+                'assigned_to': item['assigned_to'],
+                'supervisor_id': user_id,
+                'start_date': start_date,
+                'end_date': end_date,
+                'progress_status': 'incomplete'
+            })
+            row_indexes.append(index)
+        
+        if not rows:
+            return jsonify({
+                'status': 'error',
+                'message': 'No valid tasks to create',
+                'results': results
+            }), 400
+        
+        # One multi-row INSERT; ids come back in the order the rows were sent
+        task_ids = db.session.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        bump_versions('tasks')
+        
+        assigned = defaultdict(list)
+        for row, task_id in zip(rows, task_ids):
+            assigned[row['assigned_to']].append(task_id)
+        publish_many([([worker_id], 'task.assigned', {'task_ids': ids}) for worker_id, ids in assigned.items()])
+        db.session.commit()
+        
+        for index, task_id in zip(row_indexes, task_ids):
+            results[index] = {'index': index, 'status': 'created', 'task_id': task_id}
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(task_ids)} of {len(items)} tasks created',
+            'created': len(task_ids),
+            'results': results
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @task_bp.route('/tasks/<int:task_id>', methods=['PUT'])
 @jwt_required()
 def update_task(task_id):
     """Update task progress"""
     try:
         user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
+        user = get_current_user()
+        
         task = Task.query.get(task_id)
         
         if not task:
@@ -157,93 +318,37 @@ def update_task(task_id):
         
         data = request.get_json()
         
-        # Workers can only mark tasks as completed
-        if user.role == 'worker':
-            if 'progress_status' in data:
-                if data['progress_status'] == 'completed':
-                    task.progress_status = 'completed'
-                    task.completed_at = datetime.utcnow()
-                else:
-                    return jsonify({
-                        'status': 'error',
-                        'message': 'Workers can only mark tasks as completed'
-                    }), 400
-        
-        # Supervisors can approve or deny completed tasks
-        elif user.role == 'supervisor' and task.supervisor_id == user_id:
-            if 'progress_status' in data:
-                valid_statuses = ['incomplete', 'completed', 'approved', 'denied']
-                if data['progress_status'] not in valid_statuses:
-                    return jsonify({
-                        'status': 'error',
-                        'message': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'
-                    }), 400
-                
-                task.progress_status = data['progress_status']
-                
-                # Set approved_at when task is approved or denied
-                if data['progress_status'] in ['approved', 'denied']:
-                    task.approved_at = datetime.utcnow()
-                    if 'supervisor_comment' in data:
-                        task.supervisor_comment = data['supervisor_comment']
-                    
-                    # Auto-create payment record when task is approved
-                    if data['progress_status'] == 'approved':
-                        worker = User.query.get(task.assigned_to)
-                        if worker and worker.salary:
-                            # Check if payment already exists for this task
-                            existing_payment = Payment.query.filter_by(
-                                task_id=task.id,
-                                worker_id=worker.id
-                            ).first()
-                            
-                            if not existing_payment:
-                                # Create payment with default amount (can be edited by admin)
-                                payment = Payment(
-                                    worker_id=worker.id,
-                                    task_id=task.id,
-                                    amount=worker.salary,  # Default to full salary
-                                    status='unpaid'
-                                )
-                                db.session.add(payment)
-                                
-                                # Update worker's salary balance
-                                if worker.salary_balance is None:
-                                    worker.salary_balance = 0.0
-                                worker.salary_balance += worker.salary
-        
-        # Admins can update any status
-        elif user.role == 'admin':
-            if 'progress_status' in data:
-                task.progress_status = data['progress_status']
-                if data['progress_status'] == 'completed':
-                    task.completed_at = datetime.utcnow()
-                elif data['progress_status'] in ['approved', 'denied']:
-                    task.approved_at = datetime.utcnow()
-                    if 'supervisor_comment' in data:
-                        task.supervisor_comment = data['supervisor_comment']
-                    
-                    # Auto-create payment record when task is approved by admin
-                    if data['progress_status'] == 'approved':
-                        worker = User.query.get(task.assigned_to)
-                        if worker and worker.salary:
-                            existing_payment = Payment.query.filter_by(
-                                task_id=task.id,
-                                worker_id=worker.id
-                            ).first()
-                            
-                            if not existing_payment:
-                                payment = Payment(
-                                    worker_id=worker.id,
-                                    task_id=task.id,
-                                    amount=worker.salary,
-                                    status='unpaid'
-                                )
-                                db.session.add(payment)
-                                
-                                if worker.salary_balance is None:
-                                    worker.salary_balance = 0.0
-                                worker.salary_balance += worker.salary
+        # Reject edits based on a version someone else has since changed
+        conflict = version_conflict(task, data)
+        if conflict:
+            return conflict
+        
+        new_status = data.get('progress_status')
+        
+        if new_status is not None:
+            # Workers can only mark tasks as completed
+            if user.role == 'worker' and new_status != 'completed':
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Workers can only mark tasks as completed'
+                }), 400
+            
+            # Supervisors can only move their own tasks
+            if user.role == 'supervisor' and task.supervisor_id != user_id:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Access denied. You can only update the status of tasks you supervise.'
+                }), 403
+            
+            if new_status not in STATUSES:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Invalid status. Must be one of: {", ".join(STATUSES)}'
+                }), 400
+            
+            # Approving also creates the worker's payment and credits their balance
+            if new_status != task.progress_status:
+                transition_task(task, new_status, data.get('supervisor_comment'))
         
         # Supervisors/admins can update other fields
         if user.role in ['admin', 'supervisor']:
@@ -264,6 +369,16 @@ def update_task(task_id):
             'task': task.to_dict()
         }), 200
         
+    except TransitionError as e:
+        db.session.rollback()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 409
+    except StaleDataError:
+        # Another request updated the row between our read and our write
+        db.session.rollback()
+        return conflict_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -2,7 +2,13 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.user import User
 from utils.db import db
-from utils.role_checker import role_required
+from utils.etag import resource_etag, etag_matches, not_modified, with_etag
+from utils.role_checker import role_required, get_current_user
+from utils.jwt_helper import revoke_user_tokens, forget_token_versions_on_commit
+from utils.pagination import keyset_paginate, PaginationError
+from utils.versioning import version_conflict, conflict_response
+from utils.passwords import HashingBusy, busy_response
+from sqlalchemy.orm.exc import StaleDataError
 
 user_bp = Blueprint('user', __name__)
 
@@ -14,16 +20,28 @@ def get_users():
     try:
         role = request.args.get('role')
         
+        etag = resource_etag('users', 'departments', 'salary_ledger')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         if role:
-            users = User.query.filter_by(role=role).all()
+            query = User.listing_query().filter_by(role=role)
         else:
-            users = User.query.all()
+            query = User.listing_query()
         
-        return jsonify({
+        users, next_cursor = keyset_paginate(query, User.created_at, User.id)
+        
+        return with_etag(jsonify({
             'status': 'success',
-            'users': [user.to_dict() for user in users]
-        }), 200
+            'users': [user.to_dict() for user in users],
+            'next_cursor': next_cursor
+        }), etag), 200
         
+    except PaginationError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -35,6 +53,10 @@ def get_users():
 def get_user(user_id):
     """Get a specific user"""
     try:
+        etag = resource_etag('users', 'departments', 'salary_ledger')
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         user = User.query.get(user_id)
         
         if not user:
@@ -43,10 +65,10 @@ def get_user(user_id):
                 'message': 'User not found'
             }), 404
         
-        return jsonify({
+        return with_etag(jsonify({
             'status': 'success',
             'user': user.to_dict()
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
@@ -70,6 +92,13 @@ def update_user(user_id):
         
         data = request.get_json()
         
+        # Reject edits based on a version someone else has since changed
+        conflict = version_conflict(user, data)
+        if conflict:
+            return conflict
+        
+        old_claims = (user.role, user.department_id)
+        
         # Update fields
         if 'full_name' in data:
             user.full_name = data['full_name']
@@ -135,6 +164,10 @@ def update_user(user_id):
             # Admin can reset user password without old password
             user.set_password(data['password'])
         
+        # Tokens carry role and department claims, so changing either revokes them
+        if (user.role, user.department_id) != old_claims:
+            revoke_user_tokens(user)
+        
         db.session.commit()
         
         return jsonify({
@@ -143,6 +176,13 @@ def update_user(user_id):
             'user': user.to_dict()
         }), 200
         
+    except StaleDataError:
+        # Another request updated the row between our read and our write
+        db.session.rollback()
+        return conflict_response()
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -174,6 +214,7 @@ def delete_user(user_id):
             }), 404
         
         db.session.delete(user)
+        forget_token_versions_on_commit(user_id)  # Deleted users have no version, so their tokens fail
         db.session.commit()
         
         return jsonify({
@@ -193,8 +234,7 @@ def delete_user(user_id):
 def change_password():
     """Change current user's password"""
     try:
-        current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        user = get_current_user()
         
         if not user:
             return jsonify({
@@ -233,6 +273,9 @@ def change_password():
             'message': 'Password changed successfully'
         }), 200
         
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -278,6 +321,9 @@ def reset_user_password(user_id):
             'message': f'Password reset successfully for {user.full_name}'
         }), 200
         
+    except HashingBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({
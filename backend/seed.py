@@ -11,6 +11,7 @@ from models.application import Application
 from models.task import Task
 from models.contract import Contract
 from models.payment import Payment
+from utils.ledger import post_entries, to_cents
 from datetime import datetime, timedelta
 
 def seed_database():
@@ -74,8 +75,7 @@ def seed_database():
             email='worker@county.go.ke',
             role='worker',
             department_id=1,
-            salary=25000.00,
-            salary_balance=25000.00
+            salary=25000.00
         )
         worker1.set_password('password')
         db.session.add(worker1)
@@ -85,8 +85,7 @@ def seed_database():
             email='worker2@county.go.ke',
             role='worker',
             department_id=2,
-            salary=28000.00,
-            salary_balance=28000.00
+            salary=28000.00
         )
         worker2.set_password('password')
         db.session.add(worker2)
@@ -107,6 +106,13 @@ def seed_database():
         )
         applicant2.set_password('password')
         db.session.add(applicant2)
+        db.session.flush()
+        
+        # Opening balance equals salary, posted through the ledger so balance_cents matches
+        post_entries([
+            {'worker_id': worker.id, 'amount_cents': to_cents(worker.salary), 'kind': 'opening'}
+            for worker in [worker1, worker2]
+        ])
         
         db.session.commit()
         
@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+# config.py reads the environment at import time, so point it at a throwaway
+# SQLite database and cheap password hashing before the app is imported
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+os.environ['FLASK_ENV'] = 'production'
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+os.environ['OUTBOX_INLINE'] = 'false'  # Tests drain the outbox themselves
+
+import pytest
+from app import app as flask_app
+from utils.db import db
+from utils.etag import init_versions
+from utils.jwt_helper import create_user_token
+from models.user import User
+from models.department import Department
+
+@pytest.fixture
+def app():
+    """The app with an empty database"""
+    with flask_app.app_context():
+        db.engine.dispose()
+        os.remove(DATABASE_PATH)
+        db.create_all()
+    init_versions(flask_app)
+    yield flask_app
+    with flask_app.app_context():
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def user_factory(app):
+    """make_user for any app: create a user and return (id, Authorization headers)"""
+    def make_user(role, **fields):
+        with app.app_context():
+            user = User(
+                full_name=fields.pop('full_name', role.title()),
+                email=fields.pop('email', f'{role}{User.query.count()}@county.go.ke'),
+                role=role,
+                **fields
+            )
+            user.password_hash = 'unused'
+            db.session.add(user)
+            db.session.commit()
+            return user.id, {'Authorization': f'Bearer {create_user_token(user)}'}
+    return make_user
+
+@pytest.fixture
+def make_user(app):
+    """Create a user and return (id, Authorization headers)"""
+    return user_factory(app)
+
+@pytest.fixture
+def department(app):
+    with app.app_context():
+        department = Department(name='Sanitation')
+        db.session.add(department)
+        db.session.commit()
+        return department.id
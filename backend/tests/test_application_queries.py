@@ -0,0 +1,47 @@
+from flask import g
+from utils.db import db
+from models.application import Application
+from models.department import Department
+from models.job import Job
+
+def add_applications(app, make_user, count):
+    """count applications, each from its own applicant to a job in its own department"""
+    for i in range(count):
+        applicant_id, _ = make_user('applicant')
+        with app.app_context():
+            department = Department(name=f'Department {applicant_id}')
+            db.session.add(department)
+            db.session.flush()
+            job = Job(title=f'Job {i}', description='d', department_id=department.id)
+            db.session.add(job)
+            db.session.flush()
+            db.session.add(Application(applicant_id=applicant_id, job_id=job.id))
+            db.session.commit()
+
+def listing_query_count(client, headers):
+    with client:
+        response = client.get('/api/applications?limit=100', headers=headers)
+        assert response.status_code == 200
+        return len(response.get_json()['applications']), g.query_count
+
+def test_admin_listing_runs_constant_queries(app, client, make_user):
+    _, admin = make_user('admin')
+    listing_query_count(client, admin)  # Warm the token-version cache
+    
+    add_applications(app, make_user, 3)
+    small = listing_query_count(client, admin)
+    add_applications(app, make_user, 30)
+    large = listing_query_count(client, admin)
+    
+    assert small[0] == 3 and large[0] == 33
+    assert small[1] == large[1]
+
+def test_listing_includes_joined_fields(app, client, make_user):
+    _, admin = make_user('admin')
+    add_applications(app, make_user, 1)
+    
+    application = client.get('/api/applications', headers=admin).get_json()['applications'][0]
+    
+    assert application['applicant_name'] == 'Applicant'
+    assert application['job_title'] == 'Job 0'
+    assert application['department'].startswith('Department ')
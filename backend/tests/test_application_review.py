@@ -0,0 +1,41 @@
+from utils.db import db
+from models.application import Application
+from models.user import User
+from tests.test_application_queries import add_applications
+
+def test_invalid_items_get_their_own_errors(app, client, make_user, department):
+    _, admin = make_user('admin')
+    add_applications(app, make_user, 2)
+    with app.app_context():
+        first, second = [a.id for a in Application.query.order_by(Application.id)]
+
+    response = client.post('/api/applications/review', headers=admin, json={'applications': [
+        {'id': 'one', 'status': 'rejected'},
+        {'id': True, 'status': 'rejected'},
+        {'id': first, 'status': 'accepted', 'salary': '25000', 'department_id': department},
+        {'id': first, 'status': 'accepted', 'salary': -1, 'department_id': department},
+        {'id': first, 'status': 'accepted', 'salary': 25000, 'department_id': 'Sanitation'},
+        {'id': first, 'status': 'accepted', 'salary': 25000, 'department_id': 999999},
+        {'id': first, 'status': 'accepted', 'salary': 25000, 'department_id': department, 'role': 'admin'},
+        {'id': second, 'status': 'accepted', 'salary': 25000, 'department_id': department},
+        {'id': second, 'status': 'rejected'},
+    ]})
+
+    assert response.status_code == 200
+    assert [r.get('message', r['status']) for r in response.get_json()['results']] == [
+        'id must be an integer application ID',
+        'id must be an integer application ID',
+        'salary must be a non-negative number',
+        'salary must be a non-negative number',
+        'Department not found',
+        'Department not found',
+        'Invalid role. Must be one of: worker, supervisor',
+        'accepted',
+        'Application listed more than once in this review',
+    ]
+    with app.app_context():
+        accepted = db.session.get(Application, second)
+        assert accepted.status == 'accepted'
+        applicant = db.session.get(User, accepted.applicant_id)
+        assert (applicant.role, applicant.department_id, applicant.balance_cents) == ('worker', department, 2500000)
+        assert db.session.get(Application, first).status == 'pending'
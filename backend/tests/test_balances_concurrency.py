@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func
+import os
+import pytest
+import threading
+from app import create_app
+from config import ProductionConfig
+from tests.conftest import user_factory
+from utils.db import db
+from utils.etag import init_versions
+from utils.ledger import to_cents
+from utils.outbox import drain
+from models.department import Department
+from models.ledger_entry import LedgerEntry
+from models.payment import Payment
+from models.task import Task
+from models.user import User
+
+WORKERS = 4
+TASKS_PER_WORKER = 10
+SALARY = 1234.56
+
+def run_concurrently(calls):
+    """Start every call at once on its own thread; returns their results"""
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+    
+    def run(index, call):
+        barrier.wait()
+        results[index] = call()
+    
+    threads = [threading.Thread(target=run, args=(index, call)) for index, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def put(app, path, headers, body):
+    return lambda: app.test_client().put(path, headers=headers, json=body).status_code
+
+@pytest.fixture
+def postgres_app(monkeypatch):
+    """The app on an empty scratch PostgreSQL database named by TEST_POSTGRES_URL"""
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if not url:
+        pytest.skip('Set TEST_POSTGRES_URL to a scratch PostgreSQL database to run this')
+    
+    # The app checks its version rows on startup, so the tables must exist first
+    engine = create_engine(url)
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    engine.dispose()
+    
+    monkeypatch.setattr(ProductionConfig, 'SQLALCHEMY_DATABASE_URI', url)
+    monkeypatch.setattr(ProductionConfig, 'OUTBOX_INLINE', False)
+    postgres_app = create_app('production')
+    init_versions(postgres_app)
+    yield postgres_app
+    with postgres_app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+def test_concurrent_approvals_and_payouts_leave_exact_balances(app, make_user, department):
+    check_concurrent_balances(app, make_user, department)
+
+def test_concurrent_approvals_and_payouts_on_postgresql(postgres_app):
+    """Same race on PostgreSQL, where row locks and SKIP LOCKED are real"""
+    with postgres_app.app_context():
+        department = Department(name='Sanitation')
+        db.session.add(department)
+        db.session.commit()
+        department_id = department.id
+    check_concurrent_balances(postgres_app, user_factory(postgres_app), department_id)
+
+def check_concurrent_balances(app, make_user, department):
+    supervisor_id, supervisor = make_user('supervisor', department_id=department)
+    _, admin = make_user('admin')
+    worker_ids = [make_user('worker', department_id=department, salary=SALARY)[0] for _ in range(WORKERS)]
+    
+    now = datetime.utcnow()
+    with app.app_context():
+        tasks = [
+            Task(title='Sweep', description='d', assigned_to=worker_id, supervisor_id=supervisor_id,
+                 start_date=now, end_date=now + timedelta(days=1), progress_status='completed')
+            for worker_id in worker_ids for _ in range(TASKS_PER_WORKER)
+        ]
+        db.session.add_all(tasks)
+        db.session.commit()
+        task_ids = [task.id for task in tasks]
+    first, second = task_ids[::2], task_ids[1::2]
+    
+    # Supervisor and admin race to approve the first half
+    codes = run_concurrently([
+        put(app, f'/api/tasks/{task_id}', headers, {'progress_status': 'approved'})
+        for task_id in first for headers in (supervisor, admin)
+    ])
+    with app.app_context():
+        while drain():
+            pass
+        payment_ids = [payment_id for (payment_id,) in db.session.query(Payment.id)]
+    assert len(payment_ids) == len(first)
+    
+    # Then race the second half's approvals against paying every existing payment twice
+    paid = payment_ids[::2]
+    codes += run_concurrently(
+        [put(app, f'/api/tasks/{task_id}', headers, {'progress_status': 'approved'})
+         for task_id in second for headers in (supervisor, admin)]
+        + [put(app, f'/api/payments/{payment_id}', admin, {'status': 'paid'}) for payment_id in paid * 2]
+    )
+    with app.app_context():
+        while drain():
+            pass
+    
+    assert set(codes) <= {200, 409}
+    
+    with app.app_context():
+        payments_per_task = dict(
+            db.session.query(Payment.task_id, func.count(Payment.id)).group_by(Payment.task_id)
+        )
+        assert payments_per_task == {task_id: 1 for task_id in task_ids}
+        assert Payment.query.filter_by(status='paid').count() == len(paid)
+        
+        for worker_id in worker_ids:
+            worker = db.session.get(User, worker_id)
+            unpaid = Payment.query.filter_by(worker_id=worker_id, status='unpaid').count()
+            ledger_total = db.session.query(func.sum(LedgerEntry.amount_cents)).filter_by(worker_id=worker_id).scalar()
+            
+            assert worker.balance_cents == unpaid * to_cents(SALARY)
+            assert worker.balance_cents == ledger_total
+            assert worker.salary_balance == worker.balance_cents / 100
@@ -0,0 +1,89 @@
+from datetime import datetime
+import pytest
+from utils.db import db
+from models.application import Application
+from models.job import Job
+from models.payment import Payment
+from models.task import Task
+
+@pytest.fixture
+def county(app, make_user, department):
+    """A supervisor with two workers in one department, plus a worker elsewhere and an applicant"""
+    users = {
+        'admin': make_user('admin'),
+        'supervisor': make_user('supervisor', department_id=department),
+        'worker': make_user('worker', department_id=department, salary_balance=150.0),
+        'colleague': make_user('worker', department_id=department),
+        'outsider': make_user('worker'),
+        'other_supervisor': make_user('supervisor'),
+        'applicant': make_user('applicant')
+    }
+    ids = {name: user[0] for name, user in users.items()}
+    now = datetime.utcnow()
+    with app.app_context():
+        for worker, supervisor, status in [
+            ('worker', 'supervisor', 'incomplete'),
+            ('worker', 'supervisor', 'completed'),
+            ('worker', 'supervisor', 'approved'),
+            ('colleague', 'supervisor', 'completed'),
+            ('outsider', 'other_supervisor', 'denied'),
+        ]:
+            db.session.add(Task(title='Task', description='d', assigned_to=ids[worker], supervisor_id=ids[supervisor],
+                                progress_status=status, start_date=now, end_date=now))
+        db.session.add_all([
+            Payment(worker_id=ids['worker'], amount=100.0, status='unpaid'),
+            Payment(worker_id=ids['worker'], amount=50.0, status='paid', paid_at=now),
+            Payment(worker_id=ids['outsider'], amount=70.0, status='unpaid'),
+        ])
+        open_job = Job(title='Cleaner', description='d', department_id=department)
+        closed_job = Job(title='Driver', description='d', department_id=department, status='closed')
+        db.session.add_all([open_job, closed_job])
+        db.session.flush()
+        db.session.add_all([
+            Application(applicant_id=ids['applicant'], job_id=open_job.id),
+            Application(applicant_id=ids['applicant'], job_id=closed_job.id, status='rejected'),
+        ])
+        db.session.commit()
+    return {name: headers for name, (_, headers) in users.items()}
+
+def summary(client, headers):
+    response = client.get('/api/dashboard/summary', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['summary']
+
+def test_admin_sees_everything(client, county):
+    data = summary(client, county['admin'])
+
+    assert data['tasks_by_status'] == {'incomplete': 1, 'completed': 2, 'approved': 1, 'denied': 1}
+    assert data['pending_approvals'] == 2
+    assert data['applications_by_status'] == {'pending': 1, 'rejected': 1}
+    assert data['users_by_role'] == {'admin': 1, 'supervisor': 2, 'worker': 3, 'applicant': 1}
+    assert data['jobs_by_status'] == {'open': 1, 'closed': 1}
+    assert data['payments'] == {'unpaid_count': 2, 'unpaid_total': 170.0, 'paid_count': 1, 'paid_total': 50.0}
+    assert len(data['recent_tasks']) == 5
+    assert len(data['recent_applications']) == 2
+
+def test_supervisor_sees_their_tasks_and_department(client, county):
+    data = summary(client, county['supervisor'])
+
+    assert data['tasks_by_status'] == {'incomplete': 1, 'completed': 2, 'approved': 1}
+    assert data['pending_approvals'] == 2
+    assert data['department_workers'] == 2
+    assert data['payments'] == {'unpaid_count': 0, 'unpaid_total': 0.0, 'paid_count': 0, 'paid_total': 0.0}
+    assert len(data['recent_tasks']) == 4
+
+def test_worker_sees_their_tasks_and_payments(client, county):
+    data = summary(client, county['worker'])
+
+    assert data['tasks_by_status'] == {'incomplete': 1, 'completed': 1, 'approved': 1}
+    assert data['payments'] == {'unpaid_count': 1, 'unpaid_total': 100.0, 'paid_count': 1, 'paid_total': 50.0}
+    assert data['salary_balance'] == 150.0
+    assert len(data['recent_tasks']) == 3
+    assert len(data['recent_payments']) == 2
+
+def test_applicant_sees_their_applications_and_open_jobs(client, county):
+    data = summary(client, county['applicant'])
+
+    assert data['applications_by_status'] == {'pending': 1, 'rejected': 1}
+    assert data['open_jobs'] == 1
+    assert len(data['recent_applications']) == 2
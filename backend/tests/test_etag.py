@@ -0,0 +1,58 @@
+from sqlalchemy.exc import OperationalError
+from utils.db import db
+from utils import etag
+from utils.ledger import post_entries
+from models.resource_version import ResourceVersion
+from models.user import User
+
+def versions(app):
+    with app.app_context():
+        return dict(db.session.query(ResourceVersion.name, ResourceVersion.version))
+
+def test_password_and_token_changes_keep_users_version(app, make_user):
+    user_id, _ = make_user('worker')
+    before = versions(app)
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.password_hash = 'rehashed'
+        user.token_version = User.token_version + 1
+        db.session.commit()
+    assert versions(app)['users'] == before['users']
+
+    with app.app_context():
+        db.session.get(User, user_id).full_name = 'Renamed'
+        db.session.commit()
+    assert versions(app)['users'] == before['users'] + 1
+
+def test_ledger_post_bumps_salary_ledger_only(app, make_user):
+    worker_id, _ = make_user('worker')
+    before = versions(app)
+    with app.app_context():
+        post_entries([{'worker_id': worker_id, 'amount_cents': 100, 'kind': 'opening'}])
+        db.session.commit()
+    after = versions(app)
+    assert after['salary_ledger'] == before['salary_ledger'] + 1
+    assert after['users'] == before['users']
+
+def test_failed_bump_is_retried_with_the_next_one(app, make_user, monkeypatch):
+    worker_id, _ = make_user('worker')
+    before = versions(app)
+
+    def broken(self, *args, **kwargs):
+        raise OperationalError('UPDATE resource_versions', {}, Exception('database is locked'))
+
+    with app.app_context():
+        engine = db.engine
+        with monkeypatch.context() as patch:
+            patch.setattr(type(engine), 'begin', broken)
+            post_entries([{'worker_id': worker_id, 'amount_cents': 100, 'kind': 'opening'}])
+            db.session.commit()
+    assert versions(app) == before
+    assert etag._missed_tables == {'salary_ledger'}
+
+    with app.app_context():
+        db.session.get(User, worker_id).full_name = 'Renamed'
+        db.session.commit()
+    after = versions(app)
+    assert (after['salary_ledger'], after['users']) == (before['salary_ledger'] + 1, before['users'] + 1)
+    assert not etag._missed_tables
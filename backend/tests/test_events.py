@@ -0,0 +1,39 @@
+import json
+from utils.events import NOTIFY_PAYLOAD_LIMIT, _notify_payloads
+
+def test_large_batch_is_split_into_notify_sized_payloads():
+    message = {'user_ids': [7], 'event': 'task.assigned', 'data': {'task_ids': list(range(100000, 105000))}}
+
+    payloads = _notify_payloads(message)
+
+    assert len(payloads) > 1
+    assert all(len(payload.encode()) <= NOTIFY_PAYLOAD_LIMIT for payload in payloads)
+    parts = [json.loads(payload) for payload in payloads]
+    assert {part['event'] for part in parts} == {'task.assigned'}
+    assert [task_id for part in parts for task_id in part['data']['task_ids']] == message['data']['task_ids']
+
+def test_stream_token_only_opens_the_stream(client, make_user):
+    _, headers = make_user('worker')
+
+    response = client.post('/api/events/token', headers=headers)
+    assert response.status_code == 200
+    token = response.get_json()['token']
+
+    assert client.get('/api/tasks', headers={'Authorization': f'Bearer {token}'}).status_code == 401
+    assert client.post('/api/events/token', headers={'Authorization': f'Bearer {token}'}).status_code == 401
+
+def test_stream_rejects_access_token_in_query_string(client, make_user):
+    _, headers = make_user('worker')
+    access_token = headers['Authorization'].split()[1]
+
+    assert client.get(f'/api/events?token={access_token}').status_code == 401
+
+def test_stream_opens_with_stream_token(client, make_user):
+    _, headers = make_user('worker')
+    token = client.post('/api/events/token', headers=headers).get_json()['token']
+
+    response = client.get(f'/api/events?token={token}')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    response.close()
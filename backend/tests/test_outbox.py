@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+import pytest
+from utils.db import db
+from utils.outbox import drain, enqueue, handler
+from models.outbox_message import OutboxMessage
+from models.department import Department
+from models.user import User
+
+calls = {'flaky': 0}
+
+@handler('test.flaky')
+def flaky(payload):
+    calls['flaky'] += 1
+    if calls['flaky'] <= payload['failures']:
+        raise RuntimeError(f'failure {calls["flaky"]}')
+
+@handler('test.broken')
+def broken(payload):
+    raise RuntimeError('always fails')
+
+@handler('test.department')
+def add_department(payload):
+    db.session.add(Department(name=payload['name']))
+    db.session.flush()
+    if payload.get('fail'):
+        raise RuntimeError('fails after writing')
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls['flaky'] = 0
+
+def queue(app, topic, **payload):
+    with app.test_request_context():
+        enqueue(topic, **payload)
+        db.session.commit()
+
+def make_due(app):
+    """Skip the backoff so retries run on the next drain"""
+    with app.app_context():
+        OutboxMessage.query.filter_by(status='pending').update({'available_at': datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+
+def messages(app):
+    with app.app_context():
+        return {m.topic: (m.status, m.attempts, m.available_at) for m in OutboxMessage.query.all()}
+
+def test_failed_message_is_retried_with_backoff(app):
+    queue(app, 'test.flaky', failures=2)
+
+    with app.app_context():
+        before = datetime.utcnow()
+        assert drain() == 1
+    status, attempts, available_at = messages(app)['test.flaky']
+    assert (status, attempts) == ('pending', 1)
+    assert available_at >= before + timedelta(seconds=app.config['OUTBOX_BACKOFF_SECONDS'])
+
+    with app.app_context():
+        assert drain() == 0  # Not due yet
+
+    make_due(app)
+    with app.app_context():
+        before = datetime.utcnow()
+        assert drain() == 1
+    status, attempts, available_at = messages(app)['test.flaky']
+    assert (status, attempts) == ('pending', 2)
+    assert available_at >= before + timedelta(seconds=2 * app.config['OUTBOX_BACKOFF_SECONDS'])
+
+    make_due(app)
+    with app.app_context():
+        assert drain() == 1
+    assert messages(app)['test.flaky'][:2] == ('done', 3)
+
+def test_message_fails_after_max_attempts(app):
+    queue(app, 'test.broken')
+
+    for attempt in range(app.config['OUTBOX_MAX_ATTEMPTS']):
+        assert messages(app)['test.broken'][0] == 'pending'
+        make_due(app)
+        with app.app_context():
+            assert drain() == 1
+
+    assert messages(app)['test.broken'][:2] == ('failed', app.config['OUTBOX_MAX_ATTEMPTS'])
+    make_due(app)
+    with app.app_context():
+        assert drain() == 0
+        assert OutboxMessage.query.one().last_error == 'always fails'
+
+def test_failing_handler_only_rolls_back_its_own_writes(app):
+    queue(app, 'test.department', name='Roads')
+    queue(app, 'test.department', name='Water', fail=True)
+    queue(app, 'test.department', name='Health')
+
+    with app.app_context():
+        assert drain() == 3
+        assert sorted(d.name for d in Department.query.all()) == ['Health', 'Roads']
+        assert [m.status for m in OutboxMessage.query.order_by(OutboxMessage.id)] == ['done', 'pending', 'done']
+
+def test_rejected_request_is_not_committed_with_inline_outbox(app, client, make_user, monkeypatch):
+    monkeypatch.setitem(app.config, 'OUTBOX_INLINE', True)
+    admin_id, headers = make_user('admin')
+    make_user('worker', email='taken@county.go.ke')
+
+    response = client.put(f'/api/users/{admin_id}', headers=headers, json={
+        'full_name': 'Renamed',
+        'email': 'taken@county.go.ke'
+    })
+
+    assert response.status_code == 400
+    with app.app_context():
+        assert db.session.get(User, admin_id).full_name == 'Admin'
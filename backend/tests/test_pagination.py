@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+from utils.db import db
+from models.user import User
+
+def test_pages_cover_rows_with_null_sort_keys(app, client, make_user):
+    admin_id, admin = make_user('admin')
+    ids = [make_user('worker')[0] for _ in range(7)]
+    with app.app_context():
+        start = datetime(2020, 1, 1)
+        for i, user_id in enumerate(ids):
+            # Three undated users, and two sharing a timestamp
+            db.session.get(User, user_id).created_at = None if i < 3 else start + timedelta(days=min(i, 5))
+        db.session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        response = client.get('/api/users?limit=2' + (f'&cursor={cursor}' if cursor else ''), headers=admin)
+        assert response.status_code == 200
+        body = response.get_json()
+        seen += [user['id'] for user in body['users']]
+        cursor = body.get('next_cursor')
+        if not cursor:
+            break
+
+    # Undated first, then newest first, ties broken by id
+    assert seen == [ids[2], ids[1], ids[0], admin_id, ids[6], ids[5], ids[4], ids[3]]
@@ -0,0 +1,15 @@
+import pytest
+from werkzeug.security import generate_password_hash
+from utils.passwords import needs_rehash
+
+@pytest.mark.parametrize('method', ['scrypt', 'scrypt:32768:8:1', 'pbkdf2', 'pbkdf2:sha256', 'pbkdf2:sha512', 'pbkdf2:sha256:1000'])
+def test_hash_made_with_configured_method_is_kept(app, monkeypatch, method):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', method)
+    with app.app_context():
+        assert not needs_rehash(generate_password_hash('secret', method))
+
+def test_hash_made_with_other_cost_is_rehashed(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    with app.app_context():
+        assert needs_rehash(generate_password_hash('secret', 'pbkdf2:sha256:1000'))
+        assert needs_rehash(generate_password_hash('secret', 'scrypt'))
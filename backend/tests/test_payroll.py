@@ -0,0 +1,17 @@
+import pytest
+
+@pytest.mark.parametrize('body, message', [
+    ({'payment_ids': '1,2'}, 'payment_ids must be a non-empty list of integer payment IDs'),
+    ({'payment_ids': []}, 'payment_ids must be a non-empty list of integer payment IDs'),
+    ({'payment_ids': [1, 'two']}, 'payment_ids must be a non-empty list of integer payment IDs'),
+    ({'payment_ids': [1, None]}, 'payment_ids must be a non-empty list of integer payment IDs'),
+    ({'department_id': 'Sanitation'}, 'department_id must be an integer department ID'),
+    ({'date_from': 20260101}, 'Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'),
+])
+def test_invalid_filters_are_rejected(client, make_user, body, message):
+    _, admin = make_user('admin')
+
+    response = client.post('/api/payments/payroll-run', headers=admin, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == message
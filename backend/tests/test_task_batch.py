@@ -0,0 +1,31 @@
+from utils.db import db
+from models.task import Task
+
+def test_invalid_items_get_their_own_errors(app, client, make_user):
+    _, supervisor = make_user('supervisor')
+    worker_id, _ = make_user('worker')
+    task = {'title': 'Sweep', 'description': 'Market street', 'assigned_to': worker_id,
+            'start_date': '2026-01-01T08:00:00', 'end_date': '2026-01-01T17:00:00'}
+
+    response = client.post('/api/tasks/batch', headers=supervisor, json={'tasks': [
+        dict(task, title=None),
+        dict(task, title=''),
+        dict(task, title='x' * 201),
+        dict(task, description=None),
+        dict(task, description=['a']),
+        dict(task, assigned_to=True),
+        task,
+    ]})
+
+    assert response.status_code == 201
+    assert [r.get('message', r['status']) for r in response.get_json()['results']] == [
+        'title must be a non-empty string of at most 200 characters',
+        'title must be a non-empty string of at most 200 characters',
+        'title must be a non-empty string of at most 200 characters',
+        'description must be a string',
+        'description must be a string',
+        'assigned_to must be an integer worker ID',
+        'created',
+    ]
+    with app.app_context():
+        assert [t.title for t in Task.query.all()] == ['Sweep']
@@ -0,0 +1,33 @@
+from utils.db import db
+from utils import jwt_helper
+from utils.jwt_helper import get_token_version, revoke_user_tokens
+from models.user import User
+
+def test_revoked_version_is_forgotten_only_on_commit(app, make_user):
+    user_id, _ = make_user('worker')
+    with app.app_context():
+        assert get_token_version(user_id) == 0
+        revoke_user_tokens(db.session.get(User, user_id))
+        db.session.flush()
+        assert user_id in jwt_helper._token_versions  # Another request could still re-cache 0 now
+        db.session.commit()
+        assert user_id not in jwt_helper._token_versions
+        assert get_token_version(user_id) == 1
+
+def test_rolled_back_revocation_keeps_the_cache(app, make_user):
+    user_id, _ = make_user('worker')
+    with app.app_context():
+        get_token_version(user_id)
+        revoke_user_tokens(db.session.get(User, user_id))
+        db.session.rollback()
+        db.session.commit()
+        assert user_id in jwt_helper._token_versions
+
+def test_cache_keeps_the_latest_loads(app, make_user, monkeypatch):
+    monkeypatch.setitem(app.config, 'TOKEN_VERSION_CACHE_MAX', 2)
+    ids = [make_user('worker')[0] for _ in range(3)]
+    with app.app_context():
+        jwt_helper._token_versions.clear()
+        for user_id in ids:
+            get_token_version(user_id)
+        assert list(jwt_helper._token_versions) == ids[1:]
@@ -0,0 +1,137 @@
+from collections import OrderedDict
+from flask import current_app
+import threading
+import time
+
+class MemoryBackend:
+    """In-process LRU cache with per-entry TTL (one per gunicorn worker)"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, expires_at), oldest first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key, value):
+        """Set key only if it is absent or expired; True if it was set"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= time.monotonic():
+                return False
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class RedisBackend:
+    """Redis (or any Redis-compatible server) shared by every worker; LRU is the server's maxmemory-policy"""
+
+    def __init__(self, url, ttl, prefix='cwp:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CACHE_BACKEND=redis requires the redis package (pip install redis)')
+        self.ttl = ttl
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self.client.get(f'{self.prefix}{key}')
+
+    def set(self, key, value):
+        self.client.set(f'{self.prefix}{key}', value, ex=self.ttl)
+
+    def add(self, key, value):
+        """Set key only if it is absent (SET NX); True if it was set"""
+        return bool(self.client.set(f'{self.prefix}{key}', value, ex=self.ttl, nx=True))
+
+    def delete(self, key):
+        self.client.delete(f'{self.prefix}{key}')
+
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+class NullBackend:
+    """Cache that never stores anything (CACHE_BACKEND=none)"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def add(self, key, value):
+        return True
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+class ResponseCache:
+    """Read-through cache of encoded JSON bodies, keyed by ETag"""
+
+    def __init__(self):
+        self.backend = NullBackend()
+
+    def init_app(self, app):
+        backend = app.config['CACHE_BACKEND']
+        ttl = app.config['CACHE_TTL_SECONDS']
+
+        if backend == 'memory':
+            self.backend = MemoryBackend(ttl, app.config['CACHE_MAX_ENTRIES'])
+        elif backend == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'], ttl)
+        elif backend == 'none':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f'Unknown CACHE_BACKEND: {backend}')
+
+    def cached_response(self, key, build):
+        """Return the cached body for key, or call build() (a jsonify() response) and cache it.
+
+        Keys built from resource_etag() change whenever a table the response
+        reads is written, so stale entries are never served, just left to expire.
+        """
+        body = self.backend.get(key)
+        if body is not None:
+            return current_app.response_class(body, mimetype='application/json')
+
+        response = build()
+        self.backend.set(key, response.get_data())
+        return response
+
+cache = ResponseCache()
+
+def init_cache(app):
+    """Initialize the response cache with Flask app"""
+    cache.init_app(app)
@@ -0,0 +1,57 @@
+from flask import request
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/plain', 'text/html'}
+
+def _choose_encoding(algorithms):
+    """Pick the first configured encoding the client accepts"""
+    for encoding in algorithms:
+        if encoding == 'br' and brotli is None:
+            continue
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+def init_compression(app):
+    """Compress large responses with brotli or gzip, following Accept-Encoding"""
+    if not app.config['COMPRESS_ENABLED']:
+        return
+    
+    @app.after_request
+    def compress_response(response):
+        response.vary.add('Accept-Encoding')
+        
+        # Streamed listings are sent chunk by chunk and left uncompressed
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code >= 300
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+        
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        
+        encoding = _choose_encoding(app.config['COMPRESS_ALGORITHMS'])
+        if encoding is None:
+            return response
+        
+        if encoding == 'br':
+            data = brotli.compress(data, quality=app.config['COMPRESS_BROTLI_QUALITY'])
+        else:
+            data = gzip.compress(data, compresslevel=app.config['COMPRESS_GZIP_LEVEL'])
+        
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        
+        # The compressed bytes differ from the identity ones, so the tag becomes weak
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        
+        return response
@@ -1,9 +1,16 @@
+from flask import g, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Count every statement sent to the database during a request"""
+    if has_request_context():
+        g.query_count = g.get('query_count', 0) + 1
+
 def init_db(app):
     """Initialize database with Flask app"""
     db.init_app(app)
@@ -11,3 +18,17 @@ def init_db(app):
     
     with app.app_context():
         db.create_all()
+        event.listen(db.engine, 'before_cursor_execute', _count_query)
+    
+    @app.after_request
+    def check_query_budget(response):
+        """Warn about requests that run more queries than QUERY_BUDGET"""
+        query_count = g.get('query_count', 0)
+        if query_count > app.config['QUERY_BUDGET']:
+            app.logger.warning(
+                f'{request.method} {request.path} ran {query_count} queries '
+                f'(budget {app.config["QUERY_BUDGET"]})'
+            )
+        if app.debug:
+            response.headers['X-Query-Count'] = str(query_count)
+        return response
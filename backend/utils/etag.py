@@ -0,0 +1,151 @@
+import hashlib
+import time
+from flask import request, Response, current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from utils.db import db
+from models.resource_version import ResourceVersion
+
+# Tables no GET validates: the resource versions themselves and the internal outbox
+UNVERSIONED_TABLES = {ResourceVersion.__tablename__, 'outbox'}
+
+# Columns no response renders, so changing only them leaves the table's version alone
+# (a login that re-hashes a password or a token revocation doesn't invalidate listings).
+# Balances are versioned as salary_ledger, which post_entries bumps with every post
+UNVERSIONED_COLUMNS = {'users': {'password_hash', 'token_version'}}
+
+BUMP_ATTEMPTS = 3
+
+# Tables whose bump failed in this process; retried with the next bump
+_missed_tables = set()
+
+def _is_versioned_change(session, obj):
+    """True if a dirty object changed a column that some response renders"""
+    ignored = UNVERSIONED_COLUMNS.get(obj.__table__.name)
+    if not ignored:
+        return session.is_modified(obj)
+    return any(
+        attr.history.has_changes()
+        for attr in inspect(obj).attrs
+        if attr.key not in ignored
+    )
+
+def _changed_tables(session):
+    """Names of the tables touched by the objects in a flush"""
+    tables = set()
+    for obj in list(session.new) + list(session.deleted):
+        tables.add(obj.__table__.name)
+    for obj in session.dirty:
+        if _is_versioned_change(session, obj):
+            tables.add(obj.__table__.name)
+    return tables
+
+def _mark_changed(session, tables):
+    session.info.setdefault('changed_tables', set()).update(tables)
+
+def bump_versions(*tables):
+    """Invalidate cached copies of these tables once the current transaction commits.
+
+    For writes that bypass the ORM unit of work; flushed ORM changes are
+    picked up automatically.
+    """
+    _mark_changed(db.session(), tables)
+
+def _collect_after_flush(session, flush_context):
+    _mark_changed(session, _changed_tables(session))
+
+def _commit_changed(session):
+    if not session.in_nested_transaction():  # Not just a savepoint release
+        session.info['committed_tables'] = session.info.pop('changed_tables', set())
+
+def _bump_after_transaction_end(session, transaction):
+    """Bump the tables a committed transaction changed, in a short transaction of their own.
+
+    Doing it after commit keeps the hot resource_versions rows out of write
+    transactions, so writers to the same table don't queue on them. It runs
+    once the session has returned its connection to the pool, and the rows
+    are locked in name order, so concurrent bumps can't deadlock.
+    """
+    if transaction.parent is not None:
+        return
+    tables = session.info.pop('committed_tables', set()) - UNVERSIONED_TABLES
+    if not tables:
+        return
+    
+    _bump(session.get_bind(), tables)
+
+def _bump(bind, tables):
+    """Increment the versions of tables, retrying briefly on failure.
+
+    A bump that still fails is kept and retried with the next bump in this
+    process, so a stale ETag can't outlive the next write by much.
+    """
+    tables = sorted(set(tables) | _missed_tables)
+    versions = ResourceVersion.__table__
+    locked = select(versions.c.name).where(versions.c.name.in_(tables)).order_by(versions.c.name).with_for_update()
+    for attempt in range(BUMP_ATTEMPTS):
+        try:
+            with bind.begin() as connection:
+                connection.execute(
+                    versions.update().where(versions.c.name.in_(locked)).values(version=versions.c.version + 1)
+                )
+            _missed_tables.difference_update(tables)
+            return
+        except SQLAlchemyError as e:
+            error = e
+            if attempt + 1 < BUMP_ATTEMPTS:
+                time.sleep(0.05 * 2 ** attempt)
+    
+    # The write itself is committed; until a later bump succeeds ETags of these tables are stale
+    _missed_tables.update(tables)
+    current_app.logger.error(f'Could not bump versions of {", ".join(tables)}: {error}')
+
+def _discard_after_rollback(session):
+    if not session.in_nested_transaction():
+        session.info.pop('changed_tables', None)
+
+def init_versions(app):
+    """Create a version row per table and bump the versions of changed tables after each commit"""
+    with app.app_context():
+        existing = {row.name for row in ResourceVersion.query.all()}
+        for name in db.metadata.tables:
+            if name not in existing and name != ResourceVersion.__tablename__:
+                db.session.add(ResourceVersion(name=name, version=0))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # Another worker created them first
+    
+    if not event.contains(Session, 'after_flush', _collect_after_flush):
+        event.listen(Session, 'after_flush', _collect_after_flush)
+        event.listen(Session, 'after_commit', _commit_changed)
+        event.listen(Session, 'after_transaction_end', _bump_after_transaction_end)
+        event.listen(Session, 'after_rollback', _discard_after_rollback)
+
+def resource_etag(*tables, scope=None):
+    """ETag for the current request built from the versions of the tables it reads
+
+    Pass the caller's user id as scope when the response depends on who asks.
+    """
+    versions = db.session.query(ResourceVersion.name, ResourceVersion.version).filter(
+        ResourceVersion.name.in_(tables)
+    ).order_by(ResourceVersion.name).all()
+    
+    raw = f'{request.full_path}|{scope}|{versions}'
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def etag_matches(etag):
+    """True if the client already holds the representation for this ETag (weak comparison)"""
+    return request.if_none_match.contains_weak(etag)
+
+def not_modified(etag):
+    """Empty 304 response for a matching If-None-Match"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+def with_etag(response, etag):
+    """Attach an ETag to a jsonify() response"""
+    response.set_etag(etag)
+    return response
@@ -0,0 +1,164 @@
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from utils.db import db
+import itertools
+import json
+import queue
+from select import select as wait_for_io
+import sys
+import threading
+import time
+
+class Broker:
+    """Per-process fan-out of events to the SSE streams of the users they concern"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)  # user_id -> queues of that user's open streams
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._listener = None
+
+    def subscribe(self, user_id):
+        subscriber = queue.Queue(maxsize=100)
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            self._subscribers[user_id].discard(subscriber)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def dispatch(self, message):
+        """Hand a published message to every open stream of its users"""
+        message = dict(message, id=next(self._ids))
+        with self._lock:
+            subscribers = [s for user_id in message['user_ids'] for s in self._subscribers.get(user_id, ())]
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                pass  # A stalled client misses events rather than growing memory; it reloads on reconnect
+
+    def ensure_listener(self):
+        """Start this process's LISTEN thread on first use (PostgreSQL only)"""
+        if self._listener is None and db.engine.dialect.name == 'postgresql':
+            with self._lock:
+                if self._listener is None:
+                    app = current_app._get_current_object()
+                    self._listener = threading.Thread(target=_listen, args=(app, self), daemon=True)
+                    self._listener.start()
+
+broker = Broker()
+
+def _listen(app, broker):
+    """Forward NOTIFYs on EVENTS_CHANNEL to the broker, reconnecting if the connection drops"""
+    import psycopg2
+    with app.app_context():
+        dsn = db.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+    channel = app.config['EVENTS_CHANNEL']
+
+    while True:
+        try:
+            connection = psycopg2.connect(dsn)
+            connection.set_session(autocommit=True)
+            connection.cursor().execute(f'LISTEN {channel}')
+            while True:
+                if wait_for_io([connection], [], [], 60) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    broker.dispatch(json.loads(connection.notifies.pop(0).payload))
+        except Exception as e:
+            app.logger.warning(f'Event listener lost its connection: {e}')
+            time.sleep(5)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+def _notify_payloads(message):
+    """Serialize a message as payloads that each fit in one NOTIFY.
+
+    An oversized message is halved by its users, then by the longest list in
+    its data (e.g. the task_ids of a large batch), until every part fits.
+    """
+    payload = json.dumps(message)
+    if len(payload.encode()) <= NOTIFY_PAYLOAD_LIMIT:
+        return [payload]
+    
+    user_ids = message['user_ids']
+    if len(user_ids) > 1:
+        half = len(user_ids) // 2
+        parts = [dict(message, user_ids=user_ids[:half]), dict(message, user_ids=user_ids[half:])]
+    else:
+        lists = [key for key, value in message['data'].items() if isinstance(value, list) and len(value) > 1]
+        if not lists:
+            raise ValueError(f'Event {message["event"]} is too large to publish')
+        key = max(lists, key=lambda key: len(message['data'][key]))
+        values = message['data'][key]
+        half = len(values) // 2
+        parts = [dict(message, data={**message['data'], key: values[:half]}), dict(message, data={**message['data'], key: values[half:]})]
+    return [payload for part in parts for payload in _notify_payloads(part)]
+
+def publish(user_ids, event_name, data):
+    """Notify these users' SSE streams once the current transaction commits"""
+    publish_many([(user_ids, event_name, data)])
+
+def publish_many(events):
+    """Queue (user_ids, event_name, data) events for delivery on commit, in one statement.
+
+    On PostgreSQL this is a SELECT pg_notify(...), ... inside the transaction;
+    the server delivers to every process's listener only if it commits. A
+    message too large for one NOTIFY is split into several events.
+    Elsewhere (SQLite in development) the messages are held on the session
+    and dispatched in-process after commit, so they only reach streams
+    served by the same process.
+    """
+    messages = []
+    for user_ids, event_name, data in events:
+        user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+        if user_ids:
+            messages.append({'user_ids': user_ids, 'event': event_name, 'data': data})
+    if not messages:
+        return
+
+    if db.engine.dialect.name == 'postgresql':
+        channel = current_app.config['EVENTS_CHANNEL']
+        payloads = [payload for message in messages for payload in _notify_payloads(message)]
+        db.session.execute(select(*[func.pg_notify(channel, payload) for payload in payloads]))
+    else:
+        db.session.info.setdefault('pending_events', []).extend(messages)
+
+def _dispatch_after_commit(session):
+    if session.in_nested_transaction():
+        return  # A savepoint was released; wait for the real commit
+    for message in session.info.pop('pending_events', []):
+        broker.dispatch(message)
+
+def _discard_after_rollback(session):
+    if not session.in_nested_transaction():
+        session.info.pop('pending_events', None)
+
+def streams_supported(environ):
+    """False under gunicorn's sync workers, where one open stream would hold a whole worker"""
+    if 'gunicorn.socket' not in environ or environ.get('wsgi.multithread'):
+        return True  # Development server, or a threaded worker
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+        return monkey.is_module_patched('socket')
+    return False
+
+def init_events(app):
+    """Deliver in-process events on commit, and make psycopg2 cooperative under gevent workers"""
+    if not event.contains(Session, 'after_commit', _dispatch_after_commit):
+        event.listen(Session, 'after_commit', _dispatch_after_commit)
+        event.listen(Session, 'after_rollback', _discard_after_rollback)
+
+    if 'gevent' in sys.modules and app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql'):
+        from gevent import monkey
+        if monkey.is_module_patched('socket'):
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
@@ -0,0 +1,95 @@
+from functools import wraps
+from flask import request, jsonify, current_app
+from flask_jwt_extended import get_jwt_identity
+from utils.cache import MemoryBackend, RedisBackend, NullBackend
+import hashlib
+
+IN_PROGRESS = b'-'  # Placeholder while the first request with a key is running
+
+class IdempotencyStore:
+    """Responses to POSTs sent with an Idempotency-Key, kept for IDEMPOTENCY_TTL_SECONDS"""
+
+    def __init__(self):
+        self.backend = NullBackend()
+
+    def init_app(self, app):
+        backend = app.config['IDEMPOTENCY_BACKEND']
+        ttl = app.config['IDEMPOTENCY_TTL_SECONDS']
+
+        if backend == 'memory':
+            self.backend = MemoryBackend(ttl, app.config['IDEMPOTENCY_MAX_ENTRIES'])
+        elif backend == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'], ttl, prefix='cwp-idem:')
+        elif backend == 'none':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f'Unknown IDEMPOTENCY_BACKEND: {backend}')
+
+store = IdempotencyStore()
+
+def _encode(status_code, fingerprint, body):
+    """Status, request fingerprint and JSON body packed into one bytes value"""
+    return b'%03d%s%s' % (status_code, fingerprint.encode(), body)
+
+def _decode(value):
+    return int(value[:3]), value[3:43].decode(), value[43:]
+
+def idempotent(fn):
+    """Replay the stored response when a POST is retried with the same Idempotency-Key.
+
+    Keys are scoped to the caller and endpoint. The first request reserves the
+    key before running the handler, so a concurrent retry gets 409 instead of
+    a duplicate; 5xx responses release it so the client can retry. Requests
+    without the header run as usual.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return fn(*args, **kwargs)
+
+        if len(key) > 255:
+            return jsonify({
+                'status': 'error',
+                'message': 'Idempotency-Key must be at most 255 characters'
+            }), 400
+
+        store_key = hashlib.sha1(f'{get_jwt_identity()}|{request.path}|{key}'.encode()).hexdigest()
+        fingerprint = hashlib.sha1(request.get_data()).hexdigest()
+
+        if not store.backend.add(store_key, IN_PROGRESS):
+            stored = store.backend.get(store_key)
+
+            if stored is None or stored == IN_PROGRESS:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'A request with this Idempotency-Key is still being processed'
+                }), 409
+
+            status_code, stored_fingerprint, body = _decode(stored)
+            if stored_fingerprint != fingerprint:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Idempotency-Key was already used with a different request'
+                }), 422
+
+            response = current_app.response_class(body, status=status_code, mimetype='application/json')
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        try:
+            response = current_app.make_response(fn(*args, **kwargs))
+        except Exception:
+            store.backend.delete(store_key)
+            raise
+
+        if response.status_code >= 500:
+            store.backend.delete(store_key)
+        else:
+            store.backend.set(store_key, _encode(response.status_code, fingerprint, response.get_data()))
+        return response
+    return wrapper
+
+def init_idempotency(app):
+    """Initialize the Idempotency-Key store with Flask app"""
+    store.init_app(app)
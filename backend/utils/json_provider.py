@@ -0,0 +1,29 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson (datetimes are encoded natively as ISO 8601)"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def init_json(app):
+    """Install the JSON provider named by JSON_PROVIDER ('orjson' or 'default')"""
+    provider = app.config['JSON_PROVIDER']
+
+    if provider == 'orjson':
+        if orjson is None:
+            raise RuntimeError('JSON_PROVIDER=orjson requires the orjson package (pip install orjson)')
+        app.json = OrjsonProvider(app)
+    elif provider != 'default':
+        raise ValueError(f'Unknown JSON_PROVIDER: {provider}')
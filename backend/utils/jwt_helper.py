@@ -1,14 +1,120 @@
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, create_access_token
+from datetime import timedelta
 from functools import wraps
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from flask import jsonify
+from flask import jsonify, current_app, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils.db import db
+from models.user import User
+import time
 
 jwt = JWTManager()
 
+# user_id -> (token_version, loaded_at), oldest load first; shared by every request in this worker
+_token_versions = {}
+
+def create_user_token(user):
+    """Issue an access token carrying the user's role, department and token version"""
+    return create_access_token(
+        identity=str(user.id),
+        additional_claims={
+            'role': user.role,
+            'department_id': user.department_id,
+            'ver': user.token_version or 0
+        }
+    )
+
+def create_stream_token(user_id):
+    """Issue a short-lived token that only opens the caller's /api/events stream.
+
+    EventSource can't set headers, so this goes in the query string, where it
+    may end up in proxy logs; it expires after EVENTS_TOKEN_SECONDS and is
+    rejected by every other endpoint.
+    """
+    return create_access_token(
+        identity=str(user_id),
+        expires_delta=timedelta(seconds=current_app.config['EVENTS_TOKEN_SECONDS']),
+        additional_claims={'scope': 'events', 'ver': get_token_version(user_id) or 0}
+    )
+
+def get_token_version(user_id):
+    """Current token version for a user (None if deleted), cached for TOKEN_VERSION_CACHE_SECONDS"""
+    cached = _token_versions.get(user_id)
+    if cached and time.monotonic() - cached[1] < current_app.config['TOKEN_VERSION_CACHE_SECONDS']:
+        return cached[0]
+    
+    version = db.session.query(User.token_version).filter_by(id=user_id).scalar()
+    _token_versions.pop(user_id, None)  # Re-insert at the end: the dict stays in load order
+    _token_versions[user_id] = (version, time.monotonic())
+    
+    # Past TOKEN_VERSION_CACHE_MAX entries, drop the oldest loads
+    excess = len(_token_versions) - current_app.config['TOKEN_VERSION_CACHE_MAX']
+    if excess > 0:
+        for stale_id in list(_token_versions)[:excess]:
+            _token_versions.pop(stale_id, None)
+    return version
+
+def forget_token_version(user_id):
+    """Drop this worker's cached token version so the next check reloads it"""
+    _token_versions.pop(user_id, None)
+
+def forget_token_versions_on_commit(*user_ids):
+    """Forget these users' cached token versions once the current transaction commits.
+
+    Forgetting earlier would let a request in between cache the old version
+    again for TOKEN_VERSION_CACHE_SECONDS.
+    """
+    db.session.info.setdefault('revoked_user_ids', set()).update(user_ids)
+
+def revoke_user_tokens(user):
+    """Invalidate every token issued to user so far (takes effect on commit)"""
+    user.token_version = User.token_version + 1
+    forget_token_versions_on_commit(user.id)
+
+def _forget_after_commit(session):
+    if session.in_nested_transaction():
+        return  # A savepoint was released; wait for the real commit
+    for user_id in session.info.pop('revoked_user_ids', ()):
+        forget_token_version(user_id)
+
+def _discard_after_rollback(session):
+    if not session.in_nested_transaction():
+        session.info.pop('revoked_user_ids', None)
+
 def init_jwt(app):
     """Initialize JWT with Flask app"""
     jwt.init_app(app)
     
+    if not event.contains(Session, 'after_commit', _forget_after_commit):
+        event.listen(Session, 'after_commit', _forget_after_commit)
+        event.listen(Session, 'after_rollback', _discard_after_rollback)
+    
+    @jwt.token_in_blocklist_loader
+    def check_token_version(jwt_header, jwt_payload):
+        # Tokens from before role/department changes (or for deleted users) are stale
+        current_version = get_token_version(int(jwt_payload['sub']))
+        return current_version is None or jwt_payload.get('ver', 0) != current_version
+    
+    @jwt.token_verification_loader
+    def check_token_scope(jwt_header, jwt_payload):
+        # Stream tokens are only good for opening an event stream
+        return jwt_payload.get('scope') != 'events' or request.endpoint == 'events.stream_events'
+    
+    @jwt.token_verification_failed_loader
+    def wrong_scope_callback(jwt_header, jwt_payload):
+        return jsonify({
+            'status': 'error',
+            'message': 'This token can only open the event stream'
+        }), 401
+    
+    @jwt.revoked_token_loader
+    def revoked_token_callback(jwt_header, jwt_payload):
+        return jsonify({
+            'status': 'error',
+            'message': 'Token is no longer valid. Please log in again.'
+        }), 401
+    
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
         return jsonify({
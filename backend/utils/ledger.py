@@ -0,0 +1,45 @@
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy import bindparam, insert
+from utils.db import db
+from utils.etag import bump_versions
+from models.ledger_entry import LedgerEntry
+from models.user import User
+
+def to_cents(amount):
+    """Round a money amount to integer cents"""
+    return int(round(float(amount) * 100))
+
+def post_entries(entries):
+    """Append entries to the salary ledger and apply them to the cached balances.
+
+    Each entry is a dict with worker_id, amount_cents (negative for debits),
+    kind and optionally task_id / payment_id. Always two statements however
+    many entries: one INSERT into salary_ledger and one batched UPDATE that
+    adds each worker's total to users.balance_cents in SQL.
+    """
+    entries = [entry for entry in entries if entry['amount_cents']]
+    if not entries:
+        return
+    
+    created_at = datetime.utcnow()
+    db.session.execute(
+        insert(LedgerEntry.__table__),
+        [{'task_id': None, 'payment_id': None, 'created_at': created_at, **entry} for entry in entries]
+    )
+    
+    totals = defaultdict(int)
+    for entry in entries:
+        totals[entry['worker_id']] += entry['amount_cents']
+    
+    # salary_balance is kept as a float mirror of balance_cents for existing clients;
+    # users.version is left alone since balances are never edited through PUT /users
+    users = User.__table__
+    db.session.execute(
+        users.update().where(users.c.id == bindparam('worker_id')).values(
+            balance_cents=users.c.balance_cents + bindparam('delta'),
+            salary_balance=(users.c.balance_cents + bindparam('delta')) / 100.0
+        ),
+        [{'worker_id': worker_id, 'delta': delta} for worker_id, delta in totals.items()]
+    )
+    bump_versions('salary_ledger')
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from flask import current_app, g
+from utils.db import db
+from models.outbox_message import OutboxMessage
+import click
+import threading
+import time
+
+_handlers = {}
+
+def handler(topic):
+    """Register the function that carries out messages of this topic (called with the payload)"""
+    def decorator(fn):
+        _handlers[topic] = fn
+        return fn
+    return decorator
+
+def enqueue(topic, **payload):
+    """Record a side effect; it is committed (or rolled back) with the current transaction"""
+    db.session.add(OutboxMessage(topic=topic, payload=payload))
+    g.outbox_enqueued = True
+
+def _backoff(attempts):
+    """Delay before retry number attempts: OUTBOX_BACKOFF_SECONDS doubled each time, capped at an hour"""
+    return timedelta(seconds=min(current_app.config['OUTBOX_BACKOFF_SECONDS'] * 2 ** (attempts - 1), 3600))
+
+def drain(batch_size=None):
+    """Run one batch of due messages; returns how many were attempted.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    workers can drain in parallel without taking the same message. Each
+    handler runs in a savepoint: a failure rolls back only its own writes and
+    schedules a retry with exponential backoff, up to OUTBOX_MAX_ATTEMPTS.
+    """
+    now = datetime.utcnow()
+    messages = OutboxMessage.query.filter(
+        OutboxMessage.status == 'pending',
+        OutboxMessage.available_at <= now
+    ).order_by(OutboxMessage.id).limit(
+        batch_size or current_app.config['OUTBOX_BATCH_SIZE']
+    ).with_for_update(skip_locked=True).all()
+    
+    for message in messages:
+        message.attempts += 1
+        try:
+            with db.session.begin_nested():
+                fn = _handlers.get(message.topic)
+                if fn is None:
+                    raise LookupError(f'No outbox handler for topic {message.topic}')
+                fn(message.payload)
+            message.status = 'done'
+            message.processed_at = datetime.utcnow()
+            message.last_error = None
+        except Exception as e:
+            current_app.logger.warning(f'Outbox message {message.id} ({message.topic}) failed: {e}')
+            message.last_error = str(e)
+            if message.attempts >= current_app.config['OUTBOX_MAX_ATTEMPTS']:
+                message.status = 'failed'
+            else:
+                message.available_at = datetime.utcnow() + _backoff(message.attempts)
+    
+    db.session.commit()
+    return len(messages)
+
+def _drain_loop(app, wake):
+    """Background drainer: runs until nothing is due whenever woken, and every OUTBOX_SWEEP_SECONDS.
+
+    It has its own app context, hence its own session, so a drain never
+    commits or sees a request's unfinished work. Under gevent workers the
+    thread is a greenlet.
+    """
+    while True:
+        wake.wait(app.config['OUTBOX_SWEEP_SECONDS'])
+        wake.clear()
+        with app.app_context():
+            try:
+                while drain():
+                    pass
+            except Exception as e:
+                db.session.rollback()
+                app.logger.warning(f'Inline outbox drain failed: {e}')
+
+def init_outbox(app):
+    """Register the `flask worker` command and, with OUTBOX_INLINE, drain in the background"""
+    wake = threading.Event()
+    started = []
+    start_lock = threading.Lock()
+    
+    @app.after_request
+    def drain_inline(response):
+        """Wake the background drainer after a successful request that enqueued something.
+
+        The drainer is started on first use, after gunicorn has forked, so
+        every web process has one. The response does not wait for it.
+        """
+        enqueued = g.pop('outbox_enqueued', False)
+        if not app.config['OUTBOX_INLINE'] or not enqueued or not 200 <= response.status_code < 300:
+            return response
+        
+        with start_lock:
+            if not started:
+                threading.Thread(target=_drain_loop, args=(app, wake), name='outbox-drain', daemon=True).start()
+                started.append(True)
+        wake.set()
+        return response
+    
+    @app.cli.command('worker')
+    @click.option('--once', is_flag=True, help='Drain what is due and exit instead of polling.')
+    @click.option('--batch-size', type=int, default=None, help='Messages claimed per batch (OUTBOX_BATCH_SIZE).')
+    def worker(once, batch_size):
+        """Drain the outbox: run side effects queued by web requests"""
+        click.echo('Outbox worker started')
+        while True:
+            try:
+                processed = drain(batch_size)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f'Outbox drain failed: {e}')
+                processed = 0
+            
+            if once and not processed:
+                break
+            if not processed:
+                time.sleep(app.config['OUTBOX_POLL_SECONDS'])
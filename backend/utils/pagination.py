@@ -0,0 +1,75 @@
+import base64
+from datetime import datetime
+from flask import request, current_app
+from sqlalchemy import and_, or_
+
+class PaginationError(ValueError):
+    """Raised when ?limit= or ?cursor= cannot be used"""
+    pass
+
+def encode_cursor(timestamp, row_id):
+    """Build an opaque cursor from the sort key of the last returned row (timestamp may be None)"""
+    raw = f'{timestamp.isoformat() if timestamp else ""}|{row_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Turn a cursor back into its (timestamp, id) sort key"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise PaginationError('Invalid cursor')
+
+def get_limit():
+    """Read ?limit= capped at PAGE_MAX_LIMIT (PAGE_DEFAULT_LIMIT when absent)"""
+    limit = request.args.get('limit')
+    if limit is None:
+        return current_app.config['PAGE_DEFAULT_LIMIT']
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise PaginationError('Limit must be an integer')
+
+    if limit < 1:
+        raise PaginationError('Limit must be at least 1')
+
+    return min(limit, current_app.config['PAGE_MAX_LIMIT'])
+
+def keyset_paginate(query, sort_column, id_column):
+    """Return (rows, next_cursor) for one page of query, newest first.
+
+    Rows are ordered on (sort_column, id_column) descending and the page
+    starts strictly after ?cursor=, so pages stay stable while rows are
+    inserted. Rows whose sort_column is NULL come first, which is
+    PostgreSQL's own order for DESC, so the index can still be scanned
+    backwards. next_cursor is None on the last page.
+    """
+    limit = get_limit()
+    cursor = request.args.get('cursor')
+
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        if timestamp is None:
+            # Still in the leading NULLs: the rest of them, then every dated row
+            query = query.filter(or_(
+                and_(sort_column.is_(None), id_column < row_id),
+                sort_column.isnot(None)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column < timestamp,
+                and_(sort_column == timestamp, id_column < row_id)
+            ))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(sort_column.desc().nulls_first(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
@@ -0,0 +1,90 @@
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, jsonify
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+import sys
+import threading
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+class HashingBusy(Exception):
+    """Raised when no hashing slot frees up within PASSWORD_HASH_WAIT_SECONDS"""
+
+def _gevent_patched():
+    if 'gevent' not in sys.modules:
+        return False
+    from gevent import monkey
+    return monkey.is_module_patched('thread')
+
+def _get_pool():
+    """Create the hashing pool on first use (after gunicorn has forked its workers).
+
+    Under gevent workers it is a native thread pool: hashlib releases the GIL
+    while hashing and the waiting greenlet yields, so other requests keep
+    running. Otherwise it is a process pool.
+    """
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _slots = threading.BoundedSemaphore(current_app.config['PASSWORD_HASH_MAX_PENDING'])
+                if _gevent_patched():
+                    from gevent.threadpool import ThreadPool
+                    _pool = ThreadPool(current_app.config['PASSWORD_HASH_WORKERS'])
+                else:
+                    _pool = ProcessPoolExecutor(max_workers=current_app.config['PASSWORD_HASH_WORKERS'])
+    return _pool
+
+def _run(fn, *args):
+    """Run a hashing call in the pool, or inline when PASSWORD_HASH_WORKERS is 0.
+
+    At most PASSWORD_HASH_MAX_PENDING calls may be running or queued in the
+    pool per app worker. Further callers wait up to PASSWORD_HASH_WAIT_SECONDS
+    for a slot (yielding under gevent) and only then get HashingBusy, so a
+    burst is smoothed out and only a sustained storm is shed.
+    """
+    if not current_app.config['PASSWORD_HASH_WORKERS']:
+        return fn(*args)
+    pool = _get_pool()
+    if not _slots.acquire(timeout=current_app.config['PASSWORD_HASH_WAIT_SECONDS']):
+        raise HashingBusy('Too many sign-ins in progress, try again shortly')
+    try:
+        if isinstance(pool, ProcessPoolExecutor):
+            return pool.submit(fn, *args).result()
+        return pool.apply(fn, args)
+    finally:
+        _slots.release()
+
+def hash_password(password):
+    """Hash a password with PASSWORD_HASH_METHOD"""
+    return _run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+def verify_password(password_hash, password):
+    """Check a password against any Werkzeug hash, whatever cost it was made with"""
+    return _run(check_password_hash, password_hash, password)
+
+def _full_method(method):
+    """Method string with Werkzeug's defaults filled in, as it is written into hashes
+
+    e.g. 'scrypt' -> 'scrypt:32768:8:1', 'pbkdf2:sha256' -> 'pbkdf2:sha256:600000'
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt' and not args:
+        return 'scrypt:32768:8:1'
+    if name == 'pbkdf2' and len(args) < 2:
+        return f"pbkdf2:{args[0] if args else 'sha256'}:{DEFAULT_PBKDF2_ITERATIONS}"
+    return method
+
+def needs_rehash(password_hash):
+    """True if the hash was made with a different method or cost than configured"""
+    return password_hash.split('$', 1)[0] != _full_method(current_app.config['PASSWORD_HASH_METHOD'])
+
+def busy_response():
+    """503 response for a request shed by the hashing admission limit"""
+    response = jsonify({
+        'status': 'error',
+        'message': 'Too many sign-ins in progress, try again shortly'
+    })
+    response.headers['Retry-After'] = '1'
+    return response, 503
@@ -1,24 +1,35 @@
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask import jsonify, g
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
 from models.user import User
 
+def get_current_user():
+    """Return the authenticated user, loaded at most once per request"""
+    if 'current_user' not in g:
+        g.current_user = User.query.get(int(get_jwt_identity()))  # Convert string to int
+    return g.current_user
+
 def role_required(*allowed_roles):
-    """Decorator to check if user has required role"""
+    """Decorator to check if user has required role (from the token's role claim)"""
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = int(get_jwt_identity())  # Convert string to int
-            user = User.query.get(user_id)
+            role = get_jwt().get('role')
             
-            if not user:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'User not found'
-                }), 404
+            # Tokens issued before role claims existed fall back to the database
+            if role is None:
+                user = get_current_user()
+                
+                if not user:
+                    return jsonify({
+                        'status': 'error',
+                        'message': 'User not found'
+                    }), 404
+                
+                role = user.role
             
-            if user.role not in allowed_roles:
+            if role not in allowed_roles:
                 return jsonify({
                     'status': 'error',
                     'message': 'Access denied. Insufficient permissions.'
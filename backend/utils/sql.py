@@ -0,0 +1,36 @@
+from sqlalchemy import Float, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+class seconds_between(FunctionElement):
+    """Seconds from start to end (two DateTime columns), compiled per dialect"""
+    type = Float()
+    name = 'seconds_between'
+    inherit_cache = True
+
+@compiles(seconds_between)
+def _seconds_between_default(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return 'EXTRACT(EPOCH FROM (%s - %s))' % (compiler.process(end, **kw), compiler.process(start, **kw))
+
+@compiles(seconds_between, 'sqlite')
+def _seconds_between_sqlite(element, compiler, **kw):
+    start, end = list(element.clauses)
+    return '((julianday(%s) - julianday(%s)) * 86400.0)' % (compiler.process(end, **kw), compiler.process(start, **kw))
+
+def median_by(group_column, value, from_clause, *criteria):
+    """SELECT of (group, median(value)) rows, computed in the database.
+
+    Uses ROW_NUMBER()/COUNT() OVER so it runs on PostgreSQL and SQLite 3.25+
+    alike; the middle one or two rows of each group are averaged.
+    """
+    ranked = select(
+        group_column.label('grp'),
+        value.label('value'),
+        func.row_number().over(partition_by=group_column, order_by=value).label('rn'),
+        func.count().over(partition_by=group_column).label('n')
+    ).select_from(from_clause).where(*criteria).subquery()
+
+    return select(ranked.c.grp, func.avg(ranked.c.value)).where(
+        (ranked.c.rn * 2).between(ranked.c.n, ranked.c.n + 2)
+    ).group_by(ranked.c.grp)
@@ -0,0 +1,48 @@
+from flask import Response, current_app, jsonify, stream_with_context
+
+STREAM_FORMATS = ('json', 'ndjson')
+
+def _chunked(rows, chunk_size):
+    """Group encoded rows so each write to the socket carries a whole chunk"""
+    chunk = []
+    for row in rows:
+        chunk.append(current_app.json.dumps(row.to_dict()))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def stream_listing(query, sort_column, id_column, key, stream_format):
+    """Stream every row of query as a chunked response, newest first.
+
+    Rows are read with yield_per (a server-side cursor on PostgreSQL) so
+    memory stays flat however large the table is. 'json' sends the same
+    {"status": "success", key: [...]} body as the regular listing,
+    'ndjson' sends one object per line.
+    """
+    if stream_format not in STREAM_FORMATS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid stream format. Must be one of: {", ".join(STREAM_FORMATS)}'
+        }), 400
+
+    chunk_size = current_app.config['STREAM_CHUNK_SIZE']
+    rows = query.order_by(sort_column.desc().nulls_first(), id_column.desc()).yield_per(chunk_size)
+
+    def generate_ndjson():
+        for chunk in _chunked(rows, chunk_size):
+            yield '\n'.join(chunk) + '\n'
+
+    def generate_json():
+        yield f'{{"status": "success", "{key}": ['
+        separator = ''
+        for chunk in _chunked(rows, chunk_size):
+            yield separator + ','.join(chunk)
+            separator = ','
+        yield ']}'
+
+    if stream_format == 'ndjson':
+        return Response(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+
+    return Response(stream_with_context(generate_json()), mimetype='application/json')
@@ -0,0 +1,134 @@
+from datetime import datetime
+from sqlalchemy import update, insert, select, exists, literal, func
+from models.task import Task
+from models.payment import Payment
+from models.user import User
+from models.ledger_entry import LedgerEntry
+from utils.db import db
+from utils.etag import bump_versions
+from utils.events import publish, publish_many
+from utils.ledger import post_entries, to_cents
+from utils.outbox import enqueue, handler
+
+STATUSES = ['incomplete', 'completed', 'approved', 'denied']
+
+# progress_status -> statuses it may move to. Denying an approved task withdraws
+# its unpaid payment; once the payment is paid out the approval is final.
+TRANSITIONS = {
+    'incomplete': {'completed'},
+    'completed': {'approved', 'denied', 'incomplete'},
+    'denied': {'approved', 'completed', 'incomplete'},
+    'approved': {'denied'}
+}
+
+class TransitionError(ValueError):
+    """Raised for a transition the state machine forbids or that lost a race"""
+
+def transition_task(task, new_status, comment=None):
+    """Move task to new_status with one conditional UPDATE.
+
+    The UPDATE only matches while the row still has the status that was read,
+    so of two concurrent requests exactly one succeeds and the other gets a
+    TransitionError. Approving also queues the worker's payment in the outbox,
+    in the same transaction; denying an approved task withdraws it.
+    """
+    current = task.progress_status
+    if new_status not in TRANSITIONS.get(current, ()):
+        raise TransitionError(f'Cannot move a task from {current} to {new_status}')
+    
+    now = datetime.utcnow()
+    values = {'progress_status': new_status, 'version': Task.version + 1}
+    if new_status == 'completed':
+        values['completed_at'] = now
+    elif new_status in ['approved', 'denied']:
+        values['approved_at'] = now
+        if comment is not None:
+            values['supervisor_comment'] = comment
+    
+    result = db.session.execute(
+        update(Task).where(Task.id == task.id, Task.progress_status == current).values(**values)
+    )
+    if result.rowcount != 1:
+        raise TransitionError(f'Task is no longer {current}; reload and try again')
+    
+    if current == 'approved':
+        _withdraw_task_payment(task)
+    
+    bump_versions('tasks')
+    publish(
+        [task.assigned_to, task.supervisor_id],
+        'task.status',
+        {'task_id': task.id, 'progress_status': new_status}
+    )
+    
+    if new_status == 'approved':
+        enqueue('task.approved', task_id=task.id, approved_at=now.isoformat())
+
+def _withdraw_task_payment(task):
+    """Delete the unpaid payment of a task that is no longer approved and reverse its ledger credit"""
+    payments = Payment.__table__
+    ledger = LedgerEntry.__table__
+    
+    withdrawn = db.session.execute(
+        payments.delete().where(payments.c.task_id == task.id, payments.c.status != 'paid')
+        .returning(payments.c.id, payments.c.worker_id)
+    ).all()
+    if db.session.scalar(select(exists().where(payments.c.task_id == task.id))):
+        raise TransitionError('The payment for this task has already been paid out')
+    if not withdrawn:
+        return  # Not created yet (the outbox handler skips tasks no longer approved) or no salary
+    
+    credited = dict(db.session.execute(
+        select(ledger.c.payment_id, func.sum(ledger.c.amount_cents))
+        .where(ledger.c.payment_id.in_([payment_id for payment_id, worker_id in withdrawn]), ledger.c.kind == 'task_approval')
+        .group_by(ledger.c.payment_id)
+    ).all())
+    post_entries([
+        {'worker_id': worker_id, 'amount_cents': -credited.get(payment_id, 0), 'kind': 'task_reversal', 'task_id': task.id, 'payment_id': payment_id}
+        for payment_id, worker_id in withdrawn
+    ])
+    bump_versions('payments')
+
+@handler('task.approved')
+def create_task_payment(payload):
+    """Insert the unpaid payment for an approved task in one INSERT ... SELECT.
+
+    Workers without a salary get none. Safe to retry: the NOT EXISTS guard and
+    uq_payments_task_id make a second payment for the same task impossible.
+    """
+    tasks = Task.__table__
+    payments = Payment.__table__
+    users = User.__table__
+    task_id = payload['task_id']
+    
+    rows = db.session.execute(
+        insert(payments).from_select(
+            ['worker_id', 'task_id', 'amount', 'status', 'date'],
+            select(
+                users.c.id,
+                tasks.c.id,
+                users.c.salary,
+                literal('unpaid'),
+                literal(datetime.fromisoformat(payload['approved_at']), db.DateTime)
+            ).select_from(
+                tasks.join(users, tasks.c.assigned_to == users.c.id)
+            ).where(
+                tasks.c.id == task_id,
+                tasks.c.progress_status == 'approved',
+                users.c.salary > 0,
+                ~exists().where(payments.c.task_id == task_id)
+            )
+        ).returning(payments.c.id, payments.c.worker_id, payments.c.amount)
+    ).all()
+    
+    if rows:
+        # Credit the worker's salary balance through the ledger
+        post_entries([
+            {'worker_id': worker_id, 'amount_cents': to_cents(amount), 'kind': 'task_approval', 'task_id': task_id, 'payment_id': payment_id}
+            for payment_id, worker_id, amount in rows
+        ])
+        bump_versions('payments')
+        publish_many([
+            ([worker_id], 'payment.created', {'payment_id': payment_id, 'task_id': task_id})
+            for payment_id, worker_id, amount in rows
+        ])
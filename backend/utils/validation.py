@@ -0,0 +1,9 @@
+import math
+
+def is_id(value):
+    """True for an integer id from JSON (true/false are bools, not ids)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def is_amount(value):
+    """True for a finite, non-negative number from JSON, such as a salary"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value) and value >= 0
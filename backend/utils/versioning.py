@@ -0,0 +1,28 @@
+from flask import request, jsonify
+
+def version_conflict(record, data=None):
+    """409 response if the client edited an older version of record, else None.
+
+    The version the client last read comes from an If-Match: "<version>"
+    header or a 'version' field in the body; requests sending neither are not
+    checked. The record is already loaded, so this costs no query. A write
+    that lands between this check and the flush is caught by version_id_col
+    as a StaleDataError (see conflict_response).
+    """
+    if request.if_match and not request.if_match.star_tag:
+        expected = request.if_match.as_set(include_weak=True)
+    elif isinstance(data, dict) and data.get('version') is not None:
+        expected = {str(data['version'])}
+    else:
+        return None
+    
+    if str(record.version) in expected:
+        return None
+    return conflict_response()
+
+def conflict_response():
+    """409 response for an update based on a stale version"""
+    return jsonify({
+        'status': 'error',
+        'message': 'This record was changed by someone else. Reload it and try again.'
+    }), 409